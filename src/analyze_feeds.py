@@ -1,45 +1,92 @@
 #!/usr/bin/env python3
 # src/analyze_feeds.py
 
-import json
 import os
 import re
 from collections import Counter, defaultdict
+from heapq import nlargest
+from operator import itemgetter
 from datetime import datetime
-from dotenv import dotenv_values
+from urllib.parse import urlsplit
 from rss_reader import fetch_feeds
-from utils import setup_logger
+from utils import setup_logger, json_dumps, load_env, get_rss_feed_list
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Numbers that might indicate the scale of a disaster
+MAGNITUDE_RE = re.compile(r'\b\d+\.\d+\s*(magnitude|richter)\b', re.IGNORECASE)
+DEATH_RE = re.compile(r'\b\d+\s*(dead|killed|deaths|casualties)\b', re.IGNORECASE)
+EVACUATION_RE = re.compile(r'\b\d+\s*(evacuated|displaced|homeless)\b', re.IGNORECASE)
+
+# Disaster-related keywords to look for
+DISASTER_KEYWORDS = {
+    'earthquake': ['earthquake', 'quake', 'seismic', 'tremor', 'magnitude'],
+    'hurricane': ['hurricane', 'typhoon', 'cyclone', 'tropical storm'],
+    'flooding': ['flood', 'flooding', 'inundated', 'submerged', 'deluge'],
+    'wildfire': ['wildfire', 'bushfire', 'forest fire', 'blaze', 'inferno'],
+    'volcano': ['volcano', 'volcanic', 'eruption', 'lava', 'ash cloud'],
+    'tornado': ['tornado', 'twister', 'funnel cloud'],
+    'tsunami': ['tsunami', 'tidal wave'],
+    'landslide': ['landslide', 'mudslide', 'rockslide', 'avalanche'],
+    'severe_weather': ['blizzard', 'ice storm', 'hail storm', 'severe weather'],
+    'general_disaster': ['disaster', 'catastrophe', 'emergency', 'evacuation', 'casualties', 'devastation']
+}
+
+# Flattened (category, keyword) pairs, in DISASTER_KEYWORDS order
+_FLAT_KEYWORDS = [
+    (category, keyword)
+    for category, keywords in DISASTER_KEYWORDS.items()
+    for keyword in keywords
+]
+
+def _build_automaton():
+    """Build an Aho-Corasick automaton over all disaster keywords."""
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for index, (category, keyword) in enumerate(_FLAT_KEYWORDS):
+        automaton.add_word(keyword, (index, category, keyword))
+    automaton.make_automaton()
+    return automaton
+
+# Single-pass keyword matcher, built once and shared by all analyzers
+_AC_AUTOMATON = _build_automaton()
 
 class FeedAnalyzer:
     """Tool for analyzing RSS feed content and identifying disaster-related patterns."""
     
     def __init__(self):
         self.logger = setup_logger()
-        self.env_vars = dotenv_values(".env")
-        
-        # Disaster-related keywords to look for
-        self.disaster_keywords = {
-            'earthquake': ['earthquake', 'quake', 'seismic', 'tremor', 'magnitude'],
-            'hurricane': ['hurricane', 'typhoon', 'cyclone', 'tropical storm'],
-            'flooding': ['flood', 'flooding', 'inundated', 'submerged', 'deluge'],
-            'wildfire': ['wildfire', 'bushfire', 'forest fire', 'blaze', 'inferno'],
-            'volcano': ['volcano', 'volcanic', 'eruption', 'lava', 'ash cloud'],
-            'tornado': ['tornado', 'twister', 'funnel cloud'],
-            'tsunami': ['tsunami', 'tidal wave'],
-            'landslide': ['landslide', 'mudslide', 'rockslide', 'avalanche'],
-            'severe_weather': ['blizzard', 'ice storm', 'hail storm', 'severe weather'],
-            'general_disaster': ['disaster', 'catastrophe', 'emergency', 'evacuation', 'casualties', 'devastation']
-        }
+        self.env_vars = load_env()
+        
+        self.disaster_keywords = DISASTER_KEYWORDS
+        self._flat_keywords = _FLAT_KEYWORDS
+        self._ac = _AC_AUTOMATON
+        if self._ac is None:
+            self.logger.info("pyahocorasick not installed, using substring keyword scan")
+    
+    def _match_keywords(self, text):
+        """
+        Find the disaster keywords contained in text.
+        
+        Returns:
+            iterable: (category, keyword) pairs in disaster_keywords order, each keyword at most once.
+        """
+        if self._ac is None:
+            # Lazy, so callers that stop early skip the remaining substring scans
+            return ((category, keyword) for category, keyword in self._flat_keywords if keyword in text)
+        
+        found = {value for _, value in self._ac.iter(text)}
+        return [(category, keyword) for _, category, keyword in sorted(found)]
     
     def fetch_and_analyze_feeds(self):
         """Fetch articles from RSS feeds and analyze them."""
         # Parse RSS feeds from .env
-        rss_feeds = self.env_vars.get("RSS_FEEDS", "")
-        
-        if "\n" in rss_feeds:
-            rss_feed_list = [url.strip() for url in rss_feeds.split("\n") if url.strip()]
-        else:
-            rss_feed_list = [url.strip() for url in rss_feeds.split(",") if url.strip()]
+        rss_feed_list = list(get_rss_feed_list(self.env_vars.get("RSS_FEEDS", "")))
         
         self.logger.info(f"Analyzing {len(rss_feed_list)} RSS feeds...")
         
@@ -49,68 +96,65 @@ class FeedAnalyzer:
         
         return articles, rss_feed_list
     
-    def analyze_keywords(self, articles):
-        """Analyze articles for disaster-related keywords."""
+    def _prepare(self, articles):
+        """Pair each article with its lowercased title and summary text for scanning."""
+        return [
+            (article, f"{article.get('title', '')} {article.get('summary', '')}".lower())
+            for article in articles
+        ]
+    
+    def _scan_articles(self, prepared, early_exit_score=None):
+        """
+        Scan prepared (article, text) pairs for disaster-related content in a single pass.
+        
+        Parameters:
+            prepared (list): (article, text) pairs from _prepare.
+            early_exit_score (int): Stop scanning an article once its score reaches
+                this value. Keyword matches, categories and counts are then incomplete
+                for that article, so pass None (the default) when the full set is needed.
+        
+        Returns:
+            tuple: (keyword_matches, category_counts, potential_disasters) where
+                keyword_matches maps each keyword to the articles containing it,
+                category_counts counts articles per disaster category, and
+                potential_disasters lists scored articles, highest score first.
+        """
         keyword_matches = defaultdict(list)
         category_counts = Counter()
-        
-        for article in articles:
-            title = article.get('title', '').lower()
-            summary = article.get('summary', '').lower()
-            text = f"{title} {summary}"
-            
-            article_keywords = []
-            
-            for category, keywords in self.disaster_keywords.items():
-                for keyword in keywords:
-                    if keyword in text:
-                        keyword_matches[keyword].append(article)
-                        article_keywords.append(category)
-            
-            # Count categories (avoiding double-counting)
-            for category in set(article_keywords):
-                category_counts[category] += 1
-        
-        return keyword_matches, category_counts
-    
-    def identify_potential_disasters(self, articles):
-        """Identify articles that might be disaster-related based on content analysis."""
         potential_disasters = []
         
-        for article in articles:
-            title = article.get('title', '').lower()
-            summary = article.get('summary', '').lower()
-            text = f"{title} {summary}"
-            
+        for article, text in prepared:
             # Look for disaster indicators
             disaster_score = 0
             matched_categories = []
             matched_keywords = []
             
-            for category, keywords in self.disaster_keywords.items():
-                for keyword in keywords:
-                    if keyword in text:
-                        disaster_score += 1
-                        if category not in matched_categories:
-                            matched_categories.append(category)
-                        matched_keywords.append(keyword)
-            
-            # Also look for numbers that might indicate scale
-            magnitude_pattern = r'\b\d+\.\d+\s*(magnitude|richter)\b'
-            death_pattern = r'\b\d+\s*(dead|killed|deaths|casualties)\b'
-            evacuation_pattern = r'\b\d+\s*(evacuated|displaced|homeless)\b'
-            
-            if re.search(magnitude_pattern, text, re.IGNORECASE):
-                disaster_score += 2
-                matched_keywords.append('magnitude_mentioned')
+            for category, keyword in self._match_keywords(text):
+                keyword_matches[keyword].append(article)
+                disaster_score += 1
+                if category not in matched_categories:
+                    matched_categories.append(category)
+                matched_keywords.append(keyword)
+                if early_exit_score and disaster_score >= early_exit_score:
+                    break
             
-            if re.search(death_pattern, text, re.IGNORECASE):
-                disaster_score += 2
-                matched_keywords.append('casualties_mentioned')
+            # Count categories (avoiding double-counting)
+            for category in matched_categories:
+                category_counts[category] += 1
             
-            if re.search(evacuation_pattern, text, re.IGNORECASE):
-                disaster_score += 1
-                matched_keywords.append('evacuation_mentioned')
+            # Also look for numbers that might indicate scale
+            if not (early_exit_score and disaster_score >= early_exit_score):
+                if MAGNITUDE_RE.search(text):
+                    disaster_score += 2
+                    matched_keywords.append('magnitude_mentioned')
+                
+                if DEATH_RE.search(text):
+                    disaster_score += 2
+                    matched_keywords.append('casualties_mentioned')
+                
+                if EVACUATION_RE.search(text):
+                    disaster_score += 1
+                    matched_keywords.append('evacuation_mentioned')
             
             if disaster_score > 0:
                 potential_disasters.append({
@@ -123,7 +167,7 @@ class FeedAnalyzer:
         # Sort by disaster score (highest first)
         potential_disasters.sort(key=lambda x: x['disaster_score'], reverse=True)
         
-        return potential_disasters
+        return keyword_matches, category_counts, potential_disasters
     
     def generate_feed_statistics(self, articles, rss_feed_list):
         """Generate statistics about the RSS feeds."""
@@ -133,17 +177,18 @@ class FeedAnalyzer:
         for article in articles:
             link = article.get('link', '')
             if link:
-                try:
-                    # Extract domain from URL
-                    domain = link.split('/')[2] if len(link.split('/')) > 2 else 'unknown'
-                    domain_counts[domain] += 1
-                except:
-                    domain_counts['unknown'] += 1
+                domain = urlsplit(link).netloc or 'unknown'
+                domain_counts[domain] += 1
         
         return domain_counts
     
     def print_analysis_report(self, articles, rss_feed_list):
-        """Print a comprehensive analysis report."""
+        """
+        Print a comprehensive analysis report.
+        
+        Returns:
+            tuple: (potential_disasters, keyword_matches, category_counts) from the analysis.
+        """
         print("\n" + "="*80)
         print("RSS FEED ANALYSIS REPORT")
         print("="*80)
@@ -163,11 +208,13 @@ class FeedAnalyzer:
         domain_counts = self.generate_feed_statistics(articles, rss_feed_list)
         print(f"\nARTICLES BY SOURCE:")
         print("-" * 40)
-        for domain, count in domain_counts.most_common(10):
+        for domain, count in nlargest(10, domain_counts.items(), key=itemgetter(1)):
             print(f"{domain}: {count} articles")
         
         # Keyword analysis
-        keyword_matches, category_counts = self.analyze_keywords(articles)
+        keyword_matches, category_counts, potential_disasters = self._scan_articles(
+            self._prepare(articles)
+        )
         
         print(f"\nDISASTER KEYWORD ANALYSIS:")
         print("-" * 40)
@@ -181,8 +228,6 @@ class FeedAnalyzer:
             print("❌ No disaster-related keywords found in any articles!")
         
         # Potential disaster articles
-        potential_disasters = self.identify_potential_disasters(articles)
-        
         print(f"\nPOTENTIAL DISASTER ARTICLES:")
         print("-" * 40)
         
@@ -219,6 +264,8 @@ class FeedAnalyzer:
         
         # Suggestions based on analysis
         self.provide_recommendations(potential_disasters, category_counts, filter_prompt)
+        
+        return potential_disasters, keyword_matches, category_counts
     
     def provide_recommendations(self, potential_disasters, category_counts, filter_prompt):
         """Provide recommendations based on the analysis."""
@@ -288,16 +335,15 @@ def main():
             return 1
         
         # Print report
-        analyzer.print_analysis_report(articles, rss_feed_list)
+        potential_disasters, keyword_matches, category_counts = analyzer.print_analysis_report(
+            articles, rss_feed_list
+        )
         
         # Export if requested
         if args.export:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"data/feed_analysis_{timestamp}.json"
             
-            potential_disasters = analyzer.identify_potential_disasters(articles)
-            keyword_matches, category_counts = analyzer.analyze_keywords(articles)
-            
             export_data = {
                 "timestamp": datetime.now().isoformat(),
                 "total_articles": len(articles),
@@ -318,8 +364,8 @@ def main():
                 ]
             }
             
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(json_dumps(export_data, indent=True))
             
             print(f"\n📁 Detailed analysis exported to: {filename}")
         
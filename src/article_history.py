@@ -2,78 +2,144 @@
 
 import os
 import json
+import sqlite3
 import logging
 from datetime import datetime, timedelta
 
+# Earlier history formats, migrated into the database on first use
+LEGACY_HISTORY_FILES = ("data/article_history.jsonl", "data/article_history.json")
+
+
+def load_legacy_history(history_file):
+    """
+    Read an article history file written by an earlier version.
+
+    Handles both the single JSON document ({"last_cleaned", "articles"}) and
+    the JSON Lines log (a {"last_cleaned"} header followed by one
+    {"url", "title", "timestamp"} entry per line).
+
+    Parameters:
+        history_file (str): Path of the legacy history file
+
+    Returns:
+        tuple: (last_cleaned, articles) where articles maps URL to {"title", "timestamp"}
+    """
+    with open(history_file, "r") as f:
+        if not history_file.endswith(".jsonl"):
+            data = json.load(f)
+            return data.get("last_cleaned"), data.get("articles", {})
+
+        last_cleaned = None
+        articles = {}
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "url" in entry:
+                articles[entry["url"]] = entry
+            elif "last_cleaned" in entry:
+                last_cleaned = entry["last_cleaned"]
+        return last_cleaned, articles
+
 
 class ArticleHistory:
     """
     Manages the history of published articles to prevent duplicates.
+
+    Articles are stored in a SQLite table keyed by URL, so checking and
+    recording articles never rewrites the whole history.
     """
 
-    def __init__(self, history_file="data/article_history.json", retention_days=30):
+    def __init__(self, history_file="data/article_history.db", retention_days=30):
         """
         Initialize the article history tracker.
 
         Parameters:
-            history_file (str): Path to store article history
+            history_file (str): Path of the SQLite database storing article history
             retention_days (int): Number of days to retain article history
         """
         self.history_file = history_file
         self.retention_days = retention_days
-        self.history = self._load_history()
+        self.conn = self._load_history()
 
     def _load_history(self):
-        """Load article history from file."""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, "r") as f:
-                    data = json.load(f)
-                    logging.info(f"Loaded article history with {len(data.get('articles', {}))} articles from {self.history_file}")
-                    return data
-            except Exception as e:
-                logging.error(f"Error loading article history: {e}")
-        else:
-            logging.info(f"Article history file {self.history_file} not found, creating new history")
-        return {"last_cleaned": datetime.now().isoformat(), "articles": {}}
-
-    def _save_history(self):
-        """Save article history to file."""
+        """Open the history database, creating and migrating it if needed."""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
+            os.makedirs(os.path.dirname(self.history_file) or ".", exist_ok=True)
+            is_new = not os.path.exists(self.history_file)
+            conn = self._open(self.history_file)
+
+            if is_new:
+                logging.info(f"Article history file {self.history_file} not found, creating new history")
+                self._migrate_legacy_history(conn)
 
-            with open(self.history_file, "w") as f:
-                json.dump(self.history, f)
-            logging.info(f"Saved article history with {len(self.history.get('articles', {}))} articles to {self.history_file}")
+            count = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            logging.info(f"Loaded article history with {count} articles from {self.history_file}")
+            return conn
         except Exception as e:
-            logging.error(f"Error saving article history: {e}")
+            logging.error(f"Error loading article history: {e}")
+            return self._open(":memory:")
+
+    @staticmethod
+    def _open(path):
+        """Connect to a history database and ensure its schema exists."""
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles (url TEXT PRIMARY KEY, title TEXT, timestamp TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS articles_timestamp ON articles (timestamp)")
+        conn.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "INSERT OR IGNORE INTO metadata VALUES ('last_cleaned', ?)", (datetime.now().isoformat(),)
+        )
+        conn.commit()
+        return conn
+
+    def _migrate_legacy_history(self, conn):
+        """Import articles from a history file written by an earlier version."""
+        for legacy_file in LEGACY_HISTORY_FILES:
+            if not os.path.exists(legacy_file):
+                continue
+            try:
+                last_cleaned, articles = load_legacy_history(legacy_file)
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO articles VALUES (?, ?, ?)",
+                        [(url, data.get("title", ""), data["timestamp"]) for url, data in articles.items()],
+                    )
+                    if last_cleaned:
+                        conn.execute("UPDATE metadata SET value = ? WHERE key = 'last_cleaned'", (last_cleaned,))
+                logging.info(f"Migrated {len(articles)} articles from {legacy_file} to {self.history_file}")
+            except Exception as e:
+                logging.error(f"Error migrating legacy article history {legacy_file}: {e}")
+            return
 
     def _clean_old_entries(self):
         """Remove entries older than retention_days."""
         now = datetime.now()
         last_cleaned = datetime.fromisoformat(
-            self.history.get("last_cleaned", now.isoformat())
+            self.conn.execute("SELECT value FROM metadata WHERE key = 'last_cleaned'").fetchone()[0]
         )
 
-        # Only clean once per day to avoid excessive I/O
+        # Only clean once per day
         if (now - last_cleaned).days < 1:
             return
 
         cutoff_date = (now - timedelta(days=self.retention_days)).isoformat()
-        cleaned_articles = {}
 
-        for url, data in self.history["articles"].items():
-            if data["timestamp"] >= cutoff_date:
-                cleaned_articles[url] = data
-
-        self.history["articles"] = cleaned_articles
-        self.history["last_cleaned"] = now.isoformat()
-        self._save_history()
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM articles WHERE timestamp < ?", (cutoff_date,))
+                self.conn.execute(
+                    "UPDATE metadata SET value = ? WHERE key = 'last_cleaned'", (now.isoformat(),)
+                )
+            retained = self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        except Exception as e:
+            logging.error(f"Error cleaning article history: {e}")
+            return
 
-        logging.info(
-            f"Cleaned article history. Retained {len(cleaned_articles)} articles."
-        )
+        logging.info(f"Cleaned article history. Retained {retained} articles.")
 
     def is_published(self, article):
         """
@@ -86,7 +152,7 @@ class ArticleHistory:
             bool: True if article was previously published
         """
         url = article.get("link", "")
-        is_pub = url in self.history["articles"]
+        is_pub = self.conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone() is not None
         if is_pub:
             logging.debug(f"Article already published: {article.get('title', 'Untitled')}")
         return is_pub
@@ -100,16 +166,20 @@ class ArticleHistory:
         """
         now = datetime.now().isoformat()
 
-        for article in articles:
-            url = article.get("link", "")
-            if url:
-                self.history["articles"][url] = {
-                    "title": article.get("title", ""),
-                    "timestamp": now,
-                }
+        rows = [
+            (article["link"], article.get("title", ""), now)
+            for article in articles
+            if article.get("link")
+        ]
+
+        try:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?)", rows)
+            logging.info(f"Saved {len(rows)} articles to {self.history_file}")
+        except Exception as e:
+            logging.error(f"Error saving article history: {e}")
 
         logging.info(f"Marked {len(articles)} articles as published")
-        self._save_history()
         self._clean_old_entries()
 
     def filter_published(self, articles):
@@ -125,11 +195,11 @@ class ArticleHistory:
         if not articles:
             logging.info("No articles to filter")
             return []
-            
+
         total_articles = len(articles)
         filtered_articles = [article for article in articles if not self.is_published(article)]
         filtered_count = total_articles - len(filtered_articles)
-        
+
         logging.info(f"Filtered out {filtered_count} of {total_articles} articles as previously published")
-        
-        return filtered_articles
\ No newline at end of file
+
+        return filtered_articles
@@ -2,7 +2,7 @@
 # src/check_history.py
 
 import os
-import json
+import sqlite3
 import logging
 from datetime import datetime
 from utils import setup_logger
@@ -10,7 +10,7 @@ from utils import setup_logger
 def check_article_history():
     """Check the article history file and display its contents."""
     logger = setup_logger()
-    history_file = "data/article_history.json"
+    history_file = "data/article_history.db"
     
     logger.info("Checking article history...")
     logger.info(f"Current working directory: {os.getcwd()}")
@@ -27,19 +27,18 @@ def check_article_history():
     if os.path.exists(history_file):
         logger.info(f"Article history file {history_file} exists")
         try:
-            with open(history_file, "r") as f:
-                history = json.load(f)
+            conn = sqlite3.connect(history_file)
+            count = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            last_cleaned = conn.execute("SELECT value FROM metadata WHERE key = 'last_cleaned'").fetchone()
             
-            article_count = len(history.get("articles", {}))
-            last_cleaned = history.get("last_cleaned", "Never")
-            
-            logger.info(f"History contains {article_count} articles")
-            logger.info(f"Last cleaned: {last_cleaned}")
+            logger.info(f"History contains {count} articles")
+            logger.info(f"Last cleaned: {last_cleaned[0] if last_cleaned else 'Never'}")
             
             # Show sample of articles (limit to 5 for brevity)
-            sample_articles = list(history.get("articles", {}).items())[:5]
-            for url, data in sample_articles:
-                logger.info(f"Sample article: {data.get('title')} - {url[:50]}...")
+            sample_articles = conn.execute("SELECT url, title FROM articles LIMIT 5").fetchall()
+            for url, title in sample_articles:
+                logger.info(f"Sample article: {title} - {url[:50]}...")
+            conn.close()
                 
         except Exception as e:
             logger.error(f"Error reading history file: {e}")
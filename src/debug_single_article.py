@@ -2,16 +2,15 @@
 # src/debug_single_article.py
 
 import json
-from dotenv import dotenv_values
 from llm_filter import filter_stories
-from utils import setup_logger
+from utils import setup_logger, load_env
 
 def debug_single_article():
     """Debug a single test article to see GPT's detailed reasoning."""
     logger = setup_logger()
     
     # Load environment variables
-    env_vars = dotenv_values(".env")
+    env_vars = load_env()
     openai_api_key = env_vars.get("OPENAI_API_KEY")
     filter_prompt = env_vars.get("FILTER_PROMPT", "")
     filter_model = env_vars.get("FILTER_MODEL", "gpt-4-turbo")
@@ -0,0 +1,135 @@
+# src/llm_cache.py
+
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from utils import json_dumps, json_loads
+
+# SQLite limits the number of parameters in a single statement
+_MAX_QUERY_KEYS = 500
+
+
+class LLMCache:
+    """
+    Persistent store of LLM results with a time-to-live.
+
+    Results are stored as JSON in a SQLite table keyed by a digest of the
+    inputs that produced them, so they survive restarts and scheduler cycles.
+    A cache may be shared between threads. Lookups are counted in the hits
+    and misses attributes.
+    """
+
+    def __init__(self, cache_file, ttl_days=7):
+        """
+        Initialize the cache.
+
+        Parameters:
+            cache_file (str): Path of the SQLite database storing cached results
+            ttl_days (float): Number of days a cached result stays valid
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = self._connect()
+        self._purge_expired()
+
+    def _connect(self):
+        """Open the cache database, falling back to an in-memory cache on error."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+        except Exception as e:
+            logging.error(f"Error opening LLM cache {self.cache_file}: {e}")
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+
+        conn.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value TEXT, ts REAL)")
+        conn.commit()
+        return conn
+
+    def _purge_expired(self):
+        """Delete results older than the time-to-live."""
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM entries WHERE ts < ?", (time.time() - self.ttl,))
+        except Exception as e:
+            logging.error(f"Error purging LLM cache: {e}")
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Build a cache key from the inputs that determine a result.
+
+        Parameters:
+            *parts (str): Inputs such as model name, prompt and article text
+
+        Returns:
+            bytes: 16-byte digest identifying the inputs
+        """
+        # Unit separator, so parts cannot run into each other the way newlines
+        # inside an article summary could
+        return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, keys):
+        """
+        Look up several results at once.
+
+        Parameters:
+            keys (list): Cache keys
+
+        Returns:
+            dict: Unexpired results for the keys that were found
+        """
+        results = {}
+        cutoff = time.time() - self.ttl
+        keys = list(keys)
+
+        try:
+            for i in range(0, len(keys), _MAX_QUERY_KEYS):
+                chunk = keys[i:i + _MAX_QUERY_KEYS]
+                with self._lock:
+                    rows = self.conn.execute(
+                        f"SELECT key, value FROM entries WHERE ts >= ? AND key IN ({','.join('?' * len(chunk))})",
+                        (cutoff, *chunk),
+                    ).fetchall()
+                results.update((key, json_loads(value)) for key, value in rows)
+        except Exception as e:
+            logging.error(f"Error reading LLM cache: {e}")
+
+        with self._lock:
+            self.hits += len(results)
+            self.misses += len(keys) - len(results)
+
+        return results
+
+    def set_many(self, items):
+        """
+        Store several results at once.
+
+        Parameters:
+            items (dict): Results keyed by cache key; values must be JSON-serializable
+        """
+        if not items:
+            return
+
+        now = time.time()
+        try:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                    [(key, json_dumps(value), now) for key, value in items.items()],
+                )
+        except Exception as e:
+            logging.error(f"Error writing LLM cache: {e}")
+
+    def get(self, key, default=None):
+        """Return the unexpired result stored under key, or default."""
+        return self.get_many([key]).get(key, default)
+
+    def set(self, key, value):
+        """Store a result under key."""
+        self.set_many({key: value})
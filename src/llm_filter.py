@@ -1,60 +1,383 @@
 # src/llm_filter.py
 
-from openai import OpenAI
+import os
 import logging
 import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from utils import json_loads, strip_code_fence, get_openai_client
+from llm_cache import LLMCache
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
-def filter_stories(articles, filter_prompt, filter_model, openai_api_key, verbose=False):
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Cache of filter decisions shared across runs
+FILTER_CACHE_FILE = os.path.join("data", "filter_cache.db")
+
+# Maximum number of articles classified per LLM request
+DEFAULT_BATCH_SIZE = 25
+
+# Upper bound on filter requests in flight at the same time
+MAX_FILTER_WORKERS = 8
+
+# Token budget for the article text of a single batch request
+MAX_BATCH_INPUT_TOKENS = 3000
+
+# Hard ceiling on the article text of a single request; larger batches are split
+MAX_REQUEST_INPUT_TOKENS = 3500
+
+# Characters of each article summary included in batch prompts
+FILTER_SUMMARY_CHARS = 300
+
+# Flattens article fields onto a single prompt line
+_NL_TABLE = str.maketrans({"\n": " ", "\r": " "})
+
+# Tokens added per article by its number and separators in the prompt
+ARTICLE_PROMPT_OVERHEAD = 4
+
+# System messages carrying the filter criteria. Only the article text varies
+# between requests, so the prompt prefix stays identical and can be cached by
+# the API.
+_BATCH_PROMPT_TMPL = """Determine which of the given articles are relevant based on this criteria:
+"{filter_prompt}"
+
+Return ONLY valid JSON with one decision per article, using the article numbers as ids:
+{{"decisions": [{{"id": 1, "relevant": "Yes"}}, {{"id": 2, "relevant": "No"}}]}}"""
+
+_VERBOSE_PROMPT_TMPL = """Determine if the given article is relevant based on this criteria:
+"{filter_prompt}"
+
+First, briefly explain your reasoning (1-2 sentences).
+Then, answer with "DECISION: Yes" or "DECISION: No"."""
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model):
+    """Return the tiktoken encoding for model, or None if it is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logging.warning(f"Could not load tokenizer for {model}, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text, model):
+    """Count the tokens in text for model, estimating ~4 characters per token without tiktoken."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def prepare_entry(article):
+    """
+    Render an article as it appears in a batch prompt: title and summary on
+    their own lines with newlines flattened and the summary capped at
+    FILTER_SUMMARY_CHARS.
+
+    Parameters:
+        article (dict): Article dictionary.
+
+    Returns:
+        str: Prompt entry, without its number.
+    """
+    title = article.get("title", "").translate(_NL_TABLE)
+    summary = article.get("summary", "")
+    if len(summary) > FILTER_SUMMARY_CHARS:
+        summary = summary[:FILTER_SUMMARY_CHARS].translate(_NL_TABLE) + "..."
+    else:
+        summary = summary.translate(_NL_TABLE)
+    return f"Title: {title}\n   Summary: {summary}"
+
+
+def pack_batches(entries, filter_model, batch_size=DEFAULT_BATCH_SIZE, max_tokens=MAX_BATCH_INPUT_TOKENS):
+    """
+    Group prompt entries into batches that fit a token budget.
+
+    Parameters:
+        entries (list): Article prompt entries from prepare_entry.
+        filter_model (str): Model whose tokenizer is used to count tokens.
+        batch_size (int): Maximum number of entries per batch.
+        max_tokens (int): Maximum entry tokens per batch.
+
+    Yields:
+        list: Consecutive entries; a single entry over the budget gets a batch of its own.
+    """
+    batch = []
+    batch_tokens = 0
+    for entry in entries:
+        tokens = count_tokens(entry, filter_model) + ARTICLE_PROMPT_OVERHEAD
+        if batch and (len(batch) >= batch_size or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append(entry)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def classify_batch(client, batch, system_prompt, filter_model):
+    """
+    Classifies a batch of articles with a single LLM request.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        batch (list): Article prompt entries from prepare_entry.
+        system_prompt (str): _BATCH_PROMPT_TMPL filled in with the filter criteria.
+        filter_model (str): Model name to be used for filtering.
+
+    Returns:
+        list: One bool per article in the batch, True if the article is relevant.
+    """
+    article_list_text = "".join(
+        f"{idx}. {entry}\n\n" for idx, entry in enumerate(batch, start=1)
+    )
+
+    # Packing works from estimates, so split a batch that still came out too
+    # large rather than risk a truncated response
+    if len(batch) > 1 and count_tokens(article_list_text, filter_model) > MAX_REQUEST_INPUT_TOKENS:
+        middle = len(batch) // 2
+        logging.info(f"Splitting oversized filter batch of {len(batch)} articles")
+        return (
+            classify_batch(client, batch[:middle], system_prompt, filter_model)
+            + classify_batch(client, batch[middle:], system_prompt, filter_model)
+        )
+
+    response = client.chat.completions.create(
+        model=filter_model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Articles:\n\n{article_list_text}"},
+        ],
+        max_completion_tokens=20 * len(batch) + 50,
+        response_format={"type": "json_object"},
+    )
+
+    answer = response.choices[0].message.content.strip()
+    if answer.startswith("```"):
+        answer = strip_code_fence(answer)
+
+    result = json_loads(answer)
+    items = result.get("decisions", []) if isinstance(result, dict) else []
+    if not isinstance(items, list):
+        items = []
+
+    decisions = {}
+    for item in items:
+        if not isinstance(item, dict):
+            logging.warning(f"Ignoring malformed filter decision: {item}")
+            continue
+        try:
+            decisions[int(item.get("id"))] = "yes" in str(item.get("relevant", "")).lower()
+        except (TypeError, ValueError):
+            logging.warning(f"Ignoring malformed filter decision: {item}")
+
+    missing = [idx for idx in range(1, len(batch) + 1) if idx not in decisions]
+    if missing:
+        logging.warning(f"No filter decision returned for articles {missing} in batch, excluding them")
+
+    return [decisions.get(idx, False) for idx in range(1, len(batch) + 1)]
+
+
+def parse_keywords(value):
+    """
+    Parse a FILTER_KEYWORDS setting into lowercase keywords.
+
+    Parameters:
+        value (str): Comma or newline separated keywords, may be empty.
+
+    Returns:
+        tuple: Keywords, empty if none are configured.
+    """
+    separator = "\n" if "\n" in value else ","
+    return tuple(keyword.strip().lower() for keyword in value.split(separator) if keyword.strip())
+
+
+@functools.lru_cache(maxsize=4)
+def _build_keyword_matcher(keywords):
+    """Return a function testing whether lowercase text contains any of keywords."""
+    if ahocorasick is None:
+        return lambda text: any(keyword in text for keyword in keywords)
+
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text), None) is not None
+
+
+def _mentions_keywords(articles, keywords):
+    """Return one bool per article, True if its title or summary contains any of keywords."""
+    matches = _build_keyword_matcher(tuple(keywords))
+    return [
+        matches(f"{article.get('title', '')}\n{article.get('summary', '')}".lower())
+        for article in articles
+    ]
+
+
+def prefilter_articles(articles, keywords):
+    """
+    Drop articles that mention none of the keywords, before any LLM call.
+
+    Parameters:
+        articles (list): List of article dictionaries.
+        keywords (tuple): Lowercase keywords; if empty, all articles are kept.
+
+    Returns:
+        list: Articles whose title or summary contains at least one keyword.
+    """
+    if not keywords:
+        return articles
+
+    candidates = [
+        article for article, hit in zip(articles, _mentions_keywords(articles, keywords)) if hit
+    ]
+    logging.info(f"Keyword prefilter rejected {len(articles) - len(candidates)} of {len(articles)} articles")
+    return candidates
+
+
+def classify_stories(articles, filter_prompt, filter_model, openai_api_key,
+                     batch_size=DEFAULT_BATCH_SIZE, cache=None, keywords=()):
+    """
+    Classifies articles using an LLM based on a user-specified prompt.
+
+    Articles are classified in batches of up to batch_size per request, packed
+    to stay within MAX_BATCH_INPUT_TOKENS, and the batches are sent
+    concurrently.
+
+    Parameters:
+        articles (list): List of article dictionaries.
+        filter_prompt (str): Plain language prompt for filtering.
+        filter_model (str): Model name to be used for filtering.
+        openai_api_key (str): API key for OpenAI.
+        batch_size (int): Maximum number of articles classified per request.
+        cache (LLMCache): Optional cache of earlier decisions; articles found in
+            it are not sent to the LLM.
+        keywords (tuple): Optional lowercase keywords (see parse_keywords);
+            articles mentioning none of them are rejected without an LLM call.
+
+    Returns:
+        list: One decision per article, in input order: True if relevant, False
+              if not, None if the request classifying it failed.
+    """
+    client = get_openai_client(openai_api_key)
+
+    def classify(batch):
+        try:
+            return classify_batch(client, batch, system_prompt, filter_model)
+        except Exception as e:
+            logging.error(f"LLM filtering error for batch of {len(batch)} articles: {e}")
+            return [None] * len(batch)
+
+    # Articles without a title or summary give the model nothing to judge
+    candidates = [idx for idx, article in enumerate(articles) if article.get("title") or article.get("summary")]
+    if len(candidates) < len(articles):
+        logging.info(f"Skipping {len(articles) - len(candidates)} articles with no title or summary")
+
+    if keywords:
+        kept = {id(article) for article in prefilter_articles([articles[idx] for idx in candidates], keywords)}
+        candidates = [idx for idx in candidates if id(articles[idx]) in kept]
+
+    # Rejected up front unless a candidate below gets a decision
+    decisions = [False] * len(articles)
+    for idx in candidates:
+        decisions[idx] = None
+
+    # Rendered once and shared by the cache key, token packing and prompt
+    entries = {idx: prepare_entry(articles[idx]) for idx in candidates}
+
+    if cache is not None:
+        keys = {idx: LLMCache.make_key(filter_model, filter_prompt, entries[idx]) for idx in candidates}
+        cached = cache.get_many(keys.values())
+        for idx in candidates:
+            decisions[idx] = cached.get(keys[idx])
+        logging.info(f"Filter cache: {len(cached)} of {len(candidates)} articles already classified")
+
+    pending = [idx for idx in candidates if decisions[idx] is None]
+
+    system_prompt = _BATCH_PROMPT_TMPL.format(filter_prompt=filter_prompt)
+    batches = list(pack_batches([entries[idx] for idx in pending], filter_model, batch_size))
+
+    if batches:
+        # Batches are independent requests, so they run concurrently; map()
+        # keeps the results in batch order, matching the pending indices
+        with ThreadPoolExecutor(max_workers=min(MAX_FILTER_WORKERS, len(batches))) as executor:
+            new_decisions = [
+                decision
+                for batch_decisions in executor.map(classify, batches)
+                for decision in batch_decisions
+            ]
+        for idx, decision in zip(pending, new_decisions):
+            decisions[idx] = decision
+
+        # Failed batches stay None so they are retried on the next run
+        if cache is not None:
+            cache.set_many({
+                keys[idx]: decisions[idx] for idx in pending if decisions[idx] is not None
+            })
+
+    return decisions
+
+
+def filter_stories(articles, filter_prompt, filter_model, openai_api_key, verbose=False,
+                   batch_size=DEFAULT_BATCH_SIZE, cache=None, keywords=()):
     """
     Filters articles using an LLM based on a user-specified prompt.
 
+    Articles are classified in concurrent batches (see classify_stories).
+    Verbose mode classifies one article per request so the reasoning for each
+    decision can be logged.
+
     Parameters:
         articles (list): List of article dictionaries.
         filter_prompt (str): Plain language prompt for filtering.
         filter_model (str): Model name to be used for filtering.
         openai_api_key (str): API key for OpenAI.
         verbose (bool): If True, log detailed information about each decision.
+        batch_size (int): Maximum number of articles classified per request.
+        cache (LLMCache): Optional cache of earlier decisions; articles found in
+            it are not sent to the LLM. Not used in verbose mode.
+        keywords (tuple): Optional lowercase keywords (see parse_keywords);
+            articles mentioning none of them are rejected without an LLM call.
 
     Returns:
         filtered_articles (list): List of articles that meet the filter criteria.
     """
-    client = OpenAI(api_key=openai_api_key)
+    if not verbose:
+        decisions = classify_stories(
+            articles, filter_prompt, filter_model, openai_api_key,
+            batch_size=batch_size, cache=cache, keywords=keywords
+        )
+        return [article for article, relevant in zip(articles, decisions) if relevant]
+
+    client = get_openai_client(openai_api_key)
     filtered_articles = []
-    
-    if verbose:
-        logging.info(f"Starting filter with model: {filter_model}")
-        logging.info(f"Filter prompt: {filter_prompt}")
-        logging.info(f"Processing {len(articles)} articles...")
+    articles = prefilter_articles(articles, keywords)
+
+    logging.info(f"Starting filter with model: {filter_model}")
+    logging.info(f"Filter prompt: {filter_prompt}")
+    logging.info(f"Processing {len(articles)} articles...")
+
+    system_prompt = _VERBOSE_PROMPT_TMPL.format(filter_prompt=filter_prompt)
 
     for i, article in enumerate(articles, 1):
-        if verbose:
-            logging.info(f"Processing article {i}/{len(articles)}: {article.get('title', 'No title')[:50]}...")
+        logging.info(f"Processing article {i}/{len(articles)}: {article.get('title', 'No title')[:50]}...")
         
-        # For verbose mode, request reasoning
-        if verbose:
-            prompt = f"""
-            Determine if the following article is relevant based on this criteria:
-            "{filter_prompt}"
-
-            Article Title: {article.get('title')}
-            Article Summary: {article.get('summary')}
-
-            First, briefly explain your reasoning (1-2 sentences).
-            Then, answer with "DECISION: Yes" or "DECISION: No".
-            """
-            max_tokens = 100
-        else:
-            prompt = f"""
-            Determine if the following article is relevant based on this criteria:
-            "{filter_prompt}"
-
-            Article Title: {article.get('title')}
-            Article Summary: {article.get('summary')}
-
-            Answer with a single word: "Yes" or "No".
-            """
-            max_tokens = 5
+        prompt = f"Article Title: {article.get('title')}\nArticle Summary: {article.get('summary')}"
+        max_tokens = 100
 
         try:
             start_time = time.time()
@@ -62,10 +385,7 @@ def filter_stories(articles, filter_prompt, filter_model, openai_api_key, verbos
             response = client.chat.completions.create(
                 model=filter_model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "Evaluate whether this article is relevant to the given criteria.",
-                    },
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt},
                 ],
                 max_completion_tokens=max_tokens,
@@ -74,44 +394,36 @@ def filter_stories(articles, filter_prompt, filter_model, openai_api_key, verbos
             response_time = time.time() - start_time
             answer = response.choices[0].message.content.strip()
             
-            # Extract decision from response
-            if verbose:
-                # Look for "DECISION: Yes/No" pattern
-                decision_lower = answer.lower()
-                if "decision: yes" in decision_lower:
-                    decision = "yes"
-                elif "decision: no" in decision_lower:
-                    decision = "no"
-                else:
-                    # Fallback to looking for yes/no anywhere
-                    decision = "yes" if "yes" in decision_lower else "no"
-                
-                # Log detailed information
-                reasoning = answer.split("DECISION:")[0].strip() if "DECISION:" in answer else answer
-                logging.info(f"  → Decision: {decision.upper()}")
-                logging.info(f"  → Reasoning: {reasoning}")
-                logging.info(f"  → Response time: {response_time:.2f}s")
-                logging.info(f"  → Tokens used: ~{len(answer.split())}")
+            # Look for "DECISION: Yes/No" pattern
+            decision_lower = answer.lower()
+            if "decision: yes" in decision_lower:
+                decision = "yes"
+            elif "decision: no" in decision_lower:
+                decision = "no"
             else:
-                decision = answer.lower()
+                # Fallback to looking for yes/no anywhere
+                decision = "yes" if "yes" in decision_lower else "no"
+            
+            # Log detailed information
+            reasoning = answer.split("DECISION:")[0].strip() if "DECISION:" in answer else answer
+            logging.info(f"  → Decision: {decision.upper()}")
+            logging.info(f"  → Reasoning: {reasoning}")
+            logging.info(f"  → Response time: {response_time:.2f}s")
+            logging.info(f"  → Tokens used: ~{len(answer.split())}")
             
-            if "yes" in decision:
+            if decision == "yes":
                 filtered_articles.append(article)
-                if verbose:
-                    logging.info(f"  ✅ INCLUDED")
+                logging.info(f"  ✅ INCLUDED")
             else:
-                if verbose:
-                    logging.info(f"  ❌ EXCLUDED")
+                logging.info(f"  ❌ EXCLUDED")
 
         except Exception as e:
             logging.error(
                 f"LLM filtering error for article '{article.get('title')}': {e}"
             )
-            if verbose:
-                logging.error(f"  💥 ERROR - article skipped")
+            logging.error(f"  💥 ERROR - article skipped")
 
-    if verbose:
-        logging.info(f"Filter complete: {len(filtered_articles)}/{len(articles)} articles passed")
+    logging.info(f"Filter complete: {len(filtered_articles)}/{len(articles)} articles passed")
     
     return filtered_articles
 
@@ -1,14 +1,14 @@
 # src/main.py
 
 import os
-import json
 import logging
 import argparse
-from dotenv import dotenv_values
-from rss_reader import fetch_feeds
-from llm_filter import filter_stories
-from summarizer import group_and_summarize
-from utils import setup_logger
+from concurrent.futures import ThreadPoolExecutor
+from rss_reader import iter_feeds
+from llm_filter import filter_stories, parse_keywords, FILTER_CACHE_FILE, MAX_FILTER_WORKERS
+from llm_cache import LLMCache
+from summarizer import group_and_summarize, SUMMARY_CACHE_FILE
+from utils import setup_logger, json_dumps, load_env, get_rss_feed_list
 from article_history import ArticleHistory
 
 # Import optional output modules
@@ -28,15 +28,17 @@ except ImportError:
     save_summary = None
     run_dashboard = None
 
+# Supported values for --output and RSS_OUTPUT_METHOD
+OUTPUT_METHODS = ["console", "slack", "email", "web"]
+
 
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="RSS Feed Monitor")
     parser.add_argument(
         "--output",
-        choices=["console", "slack", "email", "web"],
-        default="console",
-        help="Output method (default: console)",
+        choices=OUTPUT_METHODS,
+        help="Output method (defaults to RSS_OUTPUT_METHOD in .env, or console)",
     )
     parser.add_argument(
         "--web-server", action="store_true", help="Run the web dashboard server"
@@ -103,21 +105,113 @@ def main():
         logger.info("Starting feed analysis...")
         return analyze_main()
 
+    return run(
+        output=args.output,
+        web_server=args.web_server,
+        port=args.port,
+        history_retention=args.history_retention,
+        ignore_history=args.ignore_history,
+        verbose_filter=args.verbose_filter,
+    )
+
+
+def fetch_and_filter(rss_feed_list, article_history, ignore_history, batch_size, **filter_args):
+    """
+    Fetch feeds and filter their new articles, overlapping the two.
+
+    As each feed finishes downloading, its unpublished articles are queued and
+    sent to filter_stories in chunks of batch_size while the remaining feeds
+    are still being fetched. Verbose filtering logs a decision trace per
+    article, so it runs once on all articles after fetching instead.
+
+    Parameters:
+        rss_feed_list (list): Feed URLs.
+        article_history (ArticleHistory): History used to skip published articles.
+        ignore_history (bool): Whether to keep previously published articles.
+        batch_size (int): Number of articles handed to each filter_stories call.
+        **filter_args: Remaining filter_stories arguments.
+
+    Returns:
+        tuple: (articles, unique_articles, filtered_articles), each in feed order.
+    """
+    feeds = {}
+    unique_articles = []
+    pending = []
+    futures = []
+    verbose = filter_args.get("verbose", False)
+
+    with ThreadPoolExecutor(max_workers=MAX_FILTER_WORKERS) as executor:
+        for index, feed_articles in iter_feeds(rss_feed_list):
+            feeds[index] = feed_articles
+            if not ignore_history:
+                feed_articles = [
+                    article for article in feed_articles if not article_history.is_published(article)
+                ]
+            unique_articles.extend(feed_articles)
+            if verbose:
+                continue
+            pending.extend(feed_articles)
+
+            while len(pending) >= batch_size:
+                futures.append(
+                    executor.submit(filter_stories, pending[:batch_size], batch_size=batch_size, **filter_args)
+                )
+                pending = pending[batch_size:]
+
+        if pending:
+            futures.append(executor.submit(filter_stories, pending, batch_size=batch_size, **filter_args))
+
+        filtered_articles = [article for future in futures for article in future.result()]
+
+    # Feeds complete in any order; restore the configured feed order
+    articles = [article for index in sorted(feeds) for article in feeds[index]]
+    position = {id(article): i for i, article in enumerate(articles)}
+    unique_articles.sort(key=lambda article: position[id(article)])
+    filtered_articles.sort(key=lambda article: position[id(article)])
+
+    # A single call on this thread keeps the trace in feed order, numbered once
+    if verbose:
+        filtered_articles = filter_stories(unique_articles, batch_size=batch_size, **filter_args)
+
+    return articles, unique_articles, filtered_articles
+
+
+def run(
+    output=None,
+    web_server=False,
+    port=5001,
+    history_retention=None,
+    ignore_history=False,
+    verbose_filter=False,
+):
+    """
+    Run a single fetch, filter, summarize and publish cycle.
+
+    Parameters:
+        output (str): Output method (console, slack, email, web); defaults to
+            RSS_OUTPUT_METHOD in .env, or console
+        web_server (bool): Run the web dashboard server instead of a cycle
+        port (int): Port for the web dashboard
+        history_retention (int): Number of days to retain article history (defaults to HISTORY_RETENTION_DAYS in .env)
+        ignore_history (bool): Whether to ignore article history
+        verbose_filter (bool): Whether to log detailed filter decisions
+    """
     # Load environment variables manually to properly handle multi-line values
-    env_vars = dotenv_values(".env")
+    env_vars = load_env()
     openai_api_key = env_vars.get("OPENAI_API_KEY")
 
     # Setup logger
     logger = setup_logger()
     logger.info("Starting RSS Feed Monitor...")
 
-    # Parse RSS feeds from .env
-    rss_feeds = env_vars.get("RSS_FEEDS", "")
+    if output is None:
+        output = env_vars.get("RSS_OUTPUT_METHOD", "console")
+    if output not in OUTPUT_METHODS:
+        logger.error(f"Unknown output method '{output}', expected one of {', '.join(OUTPUT_METHODS)}")
+        return
 
-    if "\n" in rss_feeds:
-        rss_feed_list = [url.strip() for url in rss_feeds.split("\n") if url.strip()]
-    else:
-        rss_feed_list = [url.strip() for url in rss_feeds.split(",") if url.strip()]
+    # Parse RSS feeds from .env
+    rss_feed_list = list(get_rss_feed_list(env_vars.get("RSS_FEEDS", "")))
 
     logger.info(f"Final RSS Feed List: {rss_feed_list}")
 
@@ -126,21 +220,29 @@ def main():
     filter_model = env_vars.get("FILTER_MODEL", "gpt-4-turbo")
     group_model = env_vars.get("GROUP_MODEL", "gpt-4-turbo")
     summarize_model = env_vars.get("SUMMARIZE_MODEL", "gpt-4-turbo")
+    group_fallback_model = env_vars.get("GROUP_FALLBACK_MODEL")
+    filter_batch_size = int(env_vars.get("FILTER_BATCH_SIZE", 25))
+    if filter_batch_size < 1:
+        logger.warning(f"FILTER_BATCH_SIZE must be at least 1, got {filter_batch_size}; using 1")
+        filter_batch_size = 1
+    filter_keywords = parse_keywords(env_vars.get("FILTER_KEYWORDS", ""))
+    use_batch_api = env_vars.get("USE_BATCH_API", "False").lower() == "true"
+    llm_concurrency = int(env_vars.get("LLM_CONCURRENCY", 8))
 
     # Get history retention period from args or env
-    history_retention_days = args.history_retention or int(
+    history_retention_days = history_retention or int(
         env_vars.get("HISTORY_RETENTION_DAYS", 30)
     )
 
     # Get web dashboard port from env if not specified in args
-    web_port = args.port if args.port != 5001 else int(env_vars.get("WEB_DASHBOARD_PORT", 5001))
+    web_port = port if port != 5001 else int(env_vars.get("WEB_DASHBOARD_PORT", 5001))
 
     if not openai_api_key:
         logger.error("OPENAI_API_KEY is not set in the .env file")
         return
 
     # Check if we should run the web server only
-    if args.web_server and run_dashboard:
+    if web_server and run_dashboard:
         logger.info(f"Starting web dashboard server on port {web_port}...")
         run_dashboard(port=web_port, debug=True)
         return
@@ -148,14 +250,29 @@ def main():
     # Initialize article history
     article_history = ArticleHistory(retention_days=history_retention_days)
 
-    # Fetch articles
-    logger.info("Fetching RSS feeds...")
-    articles = fetch_feeds(rss_feed_list)
+    # Fetch articles and filter them using LLM as feeds arrive; previously
+    # published articles are skipped unless --ignore-history is specified
+    logger.info("Fetching RSS feeds and filtering articles using LLM...")
+    if ignore_history:
+        logger.info("Article history check skipped (--ignore-history flag used).")
+    if verbose_filter:
+        logger.info("Verbose filtering enabled - detailed decisions will be logged")
+
+    articles, unique_articles, filtered_articles = fetch_and_filter(
+        rss_feed_list,
+        article_history,
+        ignore_history,
+        filter_batch_size,
+        filter_prompt=filter_prompt,
+        filter_model=filter_model,
+        openai_api_key=openai_api_key,
+        verbose=verbose_filter,
+        cache=LLMCache(FILTER_CACHE_FILE),
+        keywords=filter_keywords,
+    )
     logger.info(f"Fetched {len(articles)} articles.")
 
-    # Filter out previously published articles unless --ignore-history is specified
-    if not args.ignore_history:
-        unique_articles = article_history.filter_published(articles)
+    if not ignore_history:
         logger.info(
             f"{len(unique_articles)} unique articles after filtering previously published ones."
         )
@@ -170,25 +287,14 @@ def main():
             }
 
             # Handle outputs that need a summary even when empty
-            if args.output == "web" and save_summary:
+            if output == "web" and save_summary:
                 save_summary(empty_summary)
 
-            if args.output == "console":
-                print(json.dumps(empty_summary, indent=4))
+            if output == "console":
+                print(json_dumps(empty_summary, indent=True))
 
             return
-    else:
-        logger.info("Article history check skipped (--ignore-history flag used).")
-        unique_articles = articles
 
-    # Filter articles using LLM
-    logger.info("Filtering articles using LLM...")
-    if args.verbose_filter:
-        logger.info("Verbose filtering enabled - detailed decisions will be logged")
-    
-    filtered_articles = filter_stories(
-        unique_articles, filter_prompt, filter_model, openai_api_key, verbose=args.verbose_filter
-    )
     logger.info(f"{len(filtered_articles)} articles remain after filtering.")
 
     # If no articles remain after filtering, exit early without sending reports
@@ -199,23 +305,25 @@ def main():
     # Group and summarize
     logger.info("Grouping and summarizing articles...")
     summary = group_and_summarize(
-        filtered_articles, group_model, summarize_model, openai_api_key
+        filtered_articles, group_model, summarize_model, openai_api_key,
+        use_batch=use_batch_api, cache=LLMCache(SUMMARY_CACHE_FILE),
+        group_fallback_model=group_fallback_model, max_workers=llm_concurrency,
     )
 
     # Mark articles as published only if successfully processed and history tracking is enabled
-    if filtered_articles and not args.ignore_history:
+    if filtered_articles and not ignore_history:
         article_history.mark_as_published(filtered_articles)
         logger.info(f"Marked {len(filtered_articles)} articles as published.")
 
     # Output handling based on selected method
-    if args.output == "console" or args.output == "web":
+    if output == "console" or output == "web":
         # Output the structured JSON summary to console
-        output_json = json.dumps(summary, indent=4)
+        output_json = json_dumps(summary, indent=True)
         logger.info("Summary generated:")
         print(output_json)
 
         # Save for web dashboard if requested
-        if args.output == "web" and save_summary:
+        if output == "web" and save_summary:
             save_summary(summary)
             logger.info("Summary saved for web dashboard.")
 
@@ -224,7 +332,7 @@ def main():
                 logger.info(f"Starting web dashboard server on port {web_port}...")
                 run_dashboard(port=web_port, debug=True, use_reloader=False)
 
-    elif args.output == "slack":
+    elif output == "slack":
         if publish_to_slack:
             # Get Slack webhook URL from environment
             slack_webhook = env_vars.get("SLACK_WEBHOOK_URL")
@@ -243,7 +351,7 @@ def main():
                 "Slack publisher module not available. Install required dependencies."
             )
 
-    elif args.output == "email":
+    elif output == "email":
         if send_email:
             # Get email configuration from environment
             smtp_config = {
@@ -1,36 +1,30 @@
 #!/usr/bin/env python3
 # src/review_articles.py
 
-import json
 import os
 import logging
 from datetime import datetime
-from dotenv import dotenv_values
 from rss_reader import fetch_feeds
-from llm_filter import filter_stories
-from utils import setup_logger
+from llm_filter import classify_stories, parse_keywords
+from utils import setup_logger, load_env, json_dumps, get_rss_feed_list
 
 class ArticleReviewer:
     """Interactive tool for reviewing articles and filter decisions."""
     
     def __init__(self):
         self.logger = setup_logger()
-        self.env_vars = dotenv_values(".env")
+        self.env_vars = load_env()
         self.openai_api_key = self.env_vars.get("OPENAI_API_KEY")
         self.filter_prompt = self.env_vars.get("FILTER_PROMPT", "")
         self.filter_model = self.env_vars.get("FILTER_MODEL", "gpt-4-turbo")
+        self.filter_keywords = parse_keywords(self.env_vars.get("FILTER_KEYWORDS", ""))
         
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY is not set in the .env file")
     
     def fetch_current_articles(self):
         """Fetch articles from current RSS feeds."""
-        rss_feeds = self.env_vars.get("RSS_FEEDS", "")
-        
-        if "\n" in rss_feeds:
-            rss_feed_list = [url.strip() for url in rss_feeds.split("\n") if url.strip()]
-        else:
-            rss_feed_list = [url.strip() for url in rss_feeds.split(",") if url.strip()]
+        rss_feed_list = list(get_rss_feed_list(self.env_vars.get("RSS_FEEDS", "")))
         
         self.logger.info(f"Fetching from {len(rss_feed_list)} RSS feeds...")
         articles = fetch_feeds(rss_feed_list)
@@ -42,20 +36,24 @@ class ArticleReviewer:
         """Test the filter on a list of articles and return results."""
         self.logger.info("Testing filter on articles...")
         
-        # Test each article individually to get individual results
-        filter_results = []
+        # Classify all articles in batched requests; decisions come back in
+        # article order
+        decisions = classify_stories(
+            articles, self.filter_prompt, self.filter_model, self.openai_api_key,
+            keywords=self.filter_keywords
+        )
+        timestamp = datetime.now().isoformat()
         
-        for article in articles:
-            # Test the single article
-            filtered = filter_stories([article], self.filter_prompt, self.filter_model, self.openai_api_key)
-            
-            result = {
+        filter_results = [
+            {
                 'article': article,
-                'passed_filter': len(filtered) > 0,
-                'timestamp': datetime.now().isoformat()
+                'passed_filter': bool(decision),
+                'timestamp': timestamp,
+                # Lowercased text for keyword search, excluded from exports
+                '_search_blob': f"{article.get('title', '')}\n{article.get('summary', '')}".lower()
             }
-            
-            filter_results.append(result)
+            for article, decision in zip(articles, decisions)
+        ]
         
         return filter_results
     
@@ -140,14 +138,7 @@ class ArticleReviewer:
             print("No keyword entered.")
             return
         
-        matching = []
-        for result in filter_results:
-            article = result['article']
-            title = article.get('title', '').lower()
-            summary = article.get('summary', '').lower()
-            
-            if keyword in title or keyword in summary:
-                matching.append(result)
+        matching = [result for result in filter_results if keyword in result['_search_blob']]
         
         if not matching:
             print(f"No articles found containing '{keyword}'")
@@ -174,12 +165,15 @@ class ArticleReviewer:
             "filter_model": self.filter_model,
             "total_articles": len(filter_results),
             "passed_filter": sum(1 for r in filter_results if r['passed_filter']),
-            "results": filter_results
+            "results": [
+                {key: value for key, value in result.items() if key != '_search_blob'}
+                for result in filter_results
+            ]
         }
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(json_dumps(export_data, indent=True))
             print(f"\nResults exported to: {filename}")
         except Exception as e:
             print(f"Error exporting results: {e}")
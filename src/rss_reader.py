@@ -2,18 +2,27 @@
 
 import feedparser
 import requests
-import json
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import write_json_atomic, json_loads
 
 CACHE_FILE = os.path.join("data", "cache.json")
 
+# Upper bound on feeds downloaded at the same time
+MAX_FETCH_WORKERS = 16
+
+HEADERS = {
+    "User-Agent": "RSSFeedMonitor/1.0 (+team@ai4altruism.org)",
+    "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"
+}
+
 def load_cache():
     """Load cache from file."""
     if os.path.exists(CACHE_FILE):
         try:
-            with open(CACHE_FILE, "r") as f:
-                return json.load(f)
+            with open(CACHE_FILE, "rb") as f:
+                return json_loads(f.read())
         except Exception as e:
             logging.error(f"Error loading cache: {e}")
     return {}
@@ -21,62 +30,101 @@ def load_cache():
 def save_cache(cache):
     """Save cache to file."""
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f)
+        write_json_atomic(CACHE_FILE, cache)
     except Exception as e:
         logging.error(f"Error saving cache: {e}")
 
-def fetch_feeds(rss_feed_urls):
-    """Fetch articles from RSS feeds."""
-    articles = []
-    cache = load_cache()
-    headers = {
-        "User-Agent": "RSSFeedMonitor/1.0 (+team@ai4altruism.org)",
-        "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"
-    }
-
-    for url in rss_feed_urls:
-        url = url.strip()
-        feed_headers = headers.copy()
-
-        if url in cache:
-            cached_info = cache[url]
-            if cached_info.get("etag"):
-                feed_headers["If-None-Match"] = cached_info["etag"]
-            if cached_info.get("last_modified"):
-                feed_headers["If-Modified-Since"] = cached_info["last_modified"]
+def fetch_feed(url, cached_info=None):
+    """
+    Fetch and parse a single RSS feed.
 
-        try:
-            response = requests.get(url, headers=feed_headers, timeout=10)
-            if response.status_code == 304:
-                logging.info(f"Feed not modified: {url}")
-                feed_content = cache[url].get("content", "")
-            elif response.status_code == 200:
-                feed_content = response.text
-                cache[url] = {
-                    "etag": response.headers.get("ETag"),
-                    "last_modified": response.headers.get("Last-Modified"),
-                    "content": feed_content
-                }
-            else:
-                logging.warning(f"Received status code {response.status_code} for {url}")
-                continue
-
-            parsed_feed = feedparser.parse(feed_content)
-            if parsed_feed.bozo:
-                logging.warning(f"Error parsing feed: {url}. Error: {parsed_feed.bozo_exception}")
-                continue
-
-            for entry in parsed_feed.entries:
-                articles.append({
-                    "title": entry.get("title", ""),
-                    "link": entry.get("link", ""),
-                    "summary": entry.get("summary", ""),
-                    "published": entry.get("published", ""),
-                })
+    Parameters:
+        url (str): Feed URL.
+        cached_info (dict): Cache entry for the feed from a previous fetch, if any.
 
-        except Exception as e:
-            logging.error(f"Exception fetching feed {url}: {e}")
+    Returns:
+        tuple: (articles, cache_entry) where cache_entry is the new cache entry
+               for the feed, or None if the cache should be left unchanged.
+    """
+    feed_headers = HEADERS.copy()
+    cache_entry = None
+
+    if cached_info:
+        if cached_info.get("etag"):
+            feed_headers["If-None-Match"] = cached_info["etag"]
+        if cached_info.get("last_modified"):
+            feed_headers["If-Modified-Since"] = cached_info["last_modified"]
+
+    try:
+        response = requests.get(url, headers=feed_headers, timeout=10)
+        if response.status_code == 304:
+            logging.info(f"Feed not modified: {url}")
+            feed_content = cached_info.get("content", "")
+        elif response.status_code == 200:
+            feed_content = response.text
+            cache_entry = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content": feed_content
+            }
+        else:
+            logging.warning(f"Received status code {response.status_code} for {url}")
+            return [], None
+
+        parsed_feed = feedparser.parse(feed_content)
+        if parsed_feed.bozo:
+            logging.warning(f"Error parsing feed: {url}. Error: {parsed_feed.bozo_exception}")
+            return [], cache_entry
+
+        articles = [
+            {
+                "title": entry.get("title", ""),
+                "link": entry.get("link", ""),
+                "summary": entry.get("summary", ""),
+                "published": entry.get("published", ""),
+            }
+            for entry in parsed_feed.entries
+        ]
+        return articles, cache_entry
+
+    except Exception as e:
+        logging.error(f"Exception fetching feed {url}: {e}")
+        return [], None
+
+def iter_feeds(rss_feed_urls):
+    """
+    Fetch articles from RSS feeds, yielding each feed's articles as soon as it
+    has been downloaded.
+
+    Feeds are downloaded concurrently, so feeds are yielded in completion
+    order. The cache is saved once all feeds are done.
+
+    Yields:
+        tuple: (index, articles) where index is the feed's position in rss_feed_urls.
+    """
+    cache = load_cache()
+    urls = [url.strip() for url in rss_feed_urls]
+
+    if urls:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(urls))) as executor:
+            futures = {
+                executor.submit(fetch_feed, url, cache.get(url)): index
+                for index, url in enumerate(urls)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                feed_articles, cache_entry = future.result()
+                if cache_entry is not None:
+                    cache[urls[index]] = cache_entry
+                yield index, feed_articles
 
     save_cache(cache)
-    return articles
+
+def fetch_feeds(rss_feed_urls):
+    """
+    Fetch articles from RSS feeds.
+
+    Feeds are downloaded concurrently; articles are returned in feed order.
+    """
+    feeds = dict(iter_feeds(rss_feed_urls))
+    return [article for index in sorted(feeds) for article in feeds[index]]
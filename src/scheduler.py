@@ -1,22 +1,22 @@
 # src/scheduler.py
 
 import time
-import subprocess
 import os
 import logging
 import argparse
-from dotenv import dotenv_values
-from utils import setup_logger
+from utils import setup_logger, load_env
+from main import run, OUTPUT_METHODS
 
 
 def run_scheduler(
-    output="slack", interval=None, history_retention=None, ignore_history=False
+    output=None, interval=None, history_retention=None, ignore_history=False
 ):
     """
     Run the RSS Feed Monitor at regular intervals.
 
     Parameters:
-        output (str): Output method (console, slack, email, web)
+        output (str): Output method (console, slack, email, web); defaults to
+            RSS_OUTPUT_METHOD in .env, or slack
         interval (int): Interval in minutes between runs (defaults to PROCESS_INTERVAL in .env)
         history_retention (int): Number of days to retain article history
         ignore_history (bool): Whether to ignore article history
@@ -25,7 +25,11 @@ def run_scheduler(
     logger.info("Starting RSS Feed Monitor Scheduler...")
 
     # Load environment variables
-    env_vars = dotenv_values(".env")
+    env_vars = load_env()
+
+    # Get output method from parameter, .env, or default to Slack
+    if output is None:
+        output = env_vars.get("RSS_OUTPUT_METHOD", "slack")
 
     # Get interval from parameter, .env, or default to 60 minutes
     if interval is None:
@@ -45,25 +49,15 @@ def run_scheduler(
         logger.info(f"Running RSS Feed Monitor...")
 
         try:
-            # Run the main.py script as a subprocess
-            cmd = [
-                "python",
-                "src/main.py",
-                "--output",
-                output,
-                "--history-retention",
-                str(history_retention),
-            ]
-
-            if ignore_history:
-                cmd.append("--ignore-history")
-
-            subprocess.run(cmd, check=True)
+            # Run a cycle in-process so imports, clients and connections are reused
+            run(
+                output=output,
+                history_retention=history_retention,
+                ignore_history=ignore_history,
+            )
             logger.info(f"RSS Feed Monitor run completed successfully")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error running RSS Feed Monitor: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error(f"Error running RSS Feed Monitor: {e}")
 
         # Wait for the next interval
         next_run_time = time.time() + (interval * 60)
@@ -82,9 +76,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="RSS Feed Monitor Scheduler")
     parser.add_argument(
         "--output",
-        choices=["console", "slack", "email", "web"],
-        default="slack",
-        help="Output method (default: slack)",
+        choices=OUTPUT_METHODS,
+        help="Output method (defaults to RSS_OUTPUT_METHOD in .env, or slack)",
     )
     parser.add_argument(
         "--interval",
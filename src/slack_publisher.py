@@ -2,8 +2,26 @@
 
 import requests
 import logging
-import json
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils import json_dumps
+
+def _create_session():
+    """Create a keep-alive session that retries rate-limited and failed webhook posts."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
+# Reused across publishes so the connection to Slack stays open
+_SESSION = _create_session()
 
 def format_for_slack(summary_data):
     """
@@ -54,11 +72,12 @@ def format_for_slack(summary_data):
         
         # Add article links
         if articles:
-            link_text = "*Articles:*\n"
+            link_lines = ["*Articles:*\n"]
             for idx, article in enumerate(articles, 1):
                 title = article.get("title", "Untitled")
                 link = article.get("link", "#")
-                link_text += f"{idx}. <{link}|{title}>\n"
+                link_lines.append(f"{idx}. <{link}|{title}>\n")
+            link_text = "".join(link_lines)
             
             blocks.append({
                 "type": "section",
@@ -92,10 +111,11 @@ def publish_to_slack(summary_data, webhook_url):
     }
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             webhook_url,
-            json=payload,
-            headers={"Content-Type": "application/json"}
+            data=json_dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            timeout=10
         )
         
         if response.status_code == 200:
@@ -1,9 +1,142 @@
 # src/summarizer.py
 
-from openai import OpenAI
+from openai import BadRequestError
+import os
 import logging
 import json
 import re
+import html
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import strip_code_fence, json_dumps, json_loads, get_openai_client
+from llm_cache import LLMCache
+
+try:
+    from json_repair import repair_json
+except ImportError:
+    repair_json = None
+
+# Cache of digests and topic summaries shared across runs
+SUMMARY_CACHE_FILE = os.path.join("data", "summary_cache.db")
+
+# Maximum number of grouping and topic summary requests made at once
+MAX_GROUP_WORKERS = 8
+MAX_SUMMARY_WORKERS = 8
+
+# Maximum number of topics summarized together in one request
+SUMMARY_BUNDLE_SIZE = 5
+
+# Characters of each article summary sent to the summarize model; feed
+# summaries can run to several paragraphs of HTML
+SUMMARY_CHAR_CAP = 500
+
+SUMMARIZE_SYSTEM_PROMPT = "You are a fact-based news summarizer. You MUST use ONLY information explicitly provided in the source articles. Never add details, numbers, or facts not present in the sources. If information is missing, use general terms rather than inventing specifics."
+
+# Seconds before the first status check of a Batch API job, the longest gap
+# between checks as the interval doubles, and the longest wait
+BATCH_POLL_INTERVAL = 5
+BATCH_MAX_POLL_INTERVAL = 120
+BATCH_MAX_WAIT = 3600
+
+# Batch API job states after which no more results arrive
+_BATCH_FINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+# Structured output schemas; the server guarantees responses match them
+GROUP_SCHEMA = {
+    "name": "topic_groups",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "topics": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "topic": {"type": "string"},
+                        "articles": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "title": {"type": "string"},
+                                    "link": {"type": "string"}
+                                },
+                                "required": ["title", "link"],
+                                "additionalProperties": False
+                            }
+                        }
+                    },
+                    "required": ["topic", "articles"],
+                    "additionalProperties": False
+                }
+            }
+        },
+        "required": ["topics"],
+        "additionalProperties": False
+    }
+}
+
+SUMMARY_SCHEMA = {
+    "name": "topic_summaries",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "summaries": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "summary": {"type": "string"}
+                    },
+                    "required": ["id", "summary"],
+                    "additionalProperties": False
+                }
+            }
+        },
+        "required": ["summaries"],
+        "additionalProperties": False
+    }
+}
+
+# Repairs applied by sanitize_json_string: quotes inside strings that precede
+# another key, and keys missing their quotes
+_UNESCAPED_QUOTE_RE = re.compile(r'(?<!\\)"(?=(.*?".*?":))')
+_UNQUOTED_KEY_RE = re.compile(r'([{,]\s*)([a-zA-Z0-9_]+)(\s*:)')
+
+# Escape sequences, removed before counting the quotes on each line
+_ESCAPE_SEQUENCE_RE = re.compile(r'\\.')
+
+# Reasoning models spend completion tokens on hidden reasoning, so tighter
+# output limits only apply to other models
+_REASONING_MODEL_PREFIXES = ("gpt-5", "o1", "o3", "o4")
+
+# Articles grouped per request
+GROUP_CHUNK_SIZE = 10
+
+# Completion token budget for grouping a chunk with a non-reasoning model:
+# each article's title and link are echoed back inside the topic JSON
+GROUP_BASE_TOKENS = 200
+GROUP_TOKENS_PER_ARTICLE = 120
+GROUP_MAX_TOKENS = 2000
+
+# Characters ignored when comparing titles for duplicates
+_NON_WORD_RE = re.compile(r'\W+')
+
+# Cleanup applied by apply_summary: a leading label with markdown around it,
+# and line breaks inside the paragraph
+_SUMMARY_LABEL_RE = re.compile(r'^[#*"\s]*(Summary:|Topic:|Articles:)\s*')
+_NEWLINES_RE = re.compile(r'\n+')
+
+# Markup and runs of whitespace stripped from a feed summary before it is
+# used as a topic summary
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Models that rejected a json_schema response format; they get JSON mode instead
+_JSON_SCHEMA_UNSUPPORTED = set()
 
 def sanitize_json_string(json_string):
     """
@@ -16,23 +149,23 @@ def sanitize_json_string(json_string):
         str: Sanitized JSON string
     """
     # Remove any markdown artifacts
-    json_string = re.sub(r'^```json\s*', '', json_string)
-    json_string = re.sub(r'\s*```$', '', json_string)
+    json_string = strip_code_fence(json_string)
     
     # Fix common LLM JSON formatting issues
     # Handle improperly escaped quotes within JSON strings
-    json_string = re.sub(r'(?<!\\)"(?=(.*?".*?":))', r'\"', json_string)
+    json_string = _UNESCAPED_QUOTE_RE.sub(r'\"', json_string)
     
     # Fix missing quotes around keys (not standard JSON but LLMs sometimes do this)
-    json_string = re.sub(r'([{,]\s*)([a-zA-Z0-9_]+)(\s*:)', r'\1"\2"\3', json_string)
+    json_string = _UNQUOTED_KEY_RE.sub(r'\1"\2"\3', json_string)
     
-    # Fix unterminated strings by adding a closing quote if there's an opening one
+    # Fix unterminated strings by adding a closing quote if there's an opening one.
+    # Escaped quotes are dropped in one pass over the whole string so they do
+    # not count; removing them leaves the line breaks in place
     lines = json_string.split('\n')
-    for i, line in enumerate(lines):
-        # Count quotes in this line
-        quotes = line.count('"')
+    unescaped_lines = _ESCAPE_SEQUENCE_RE.sub('', json_string).split('\n')
+    for i, (line, unescaped_line) in enumerate(zip(lines, unescaped_lines)):
         # If odd number of quotes, add one at the end
-        if quotes % 2 == 1 and not line.strip().endswith(','):
+        if unescaped_line.count('"') % 2 == 1 and not line.strip().endswith(','):
             lines[i] = line + '"'
     
     json_string = '\n'.join(lines)
@@ -51,60 +184,133 @@ def validate_json(json_string):
     """
     try:
         # Try parsing as is
-        parsed = json.loads(json_string)
+        parsed = json_loads(json_string)
         return True, parsed
     except json.JSONDecodeError as e:
         logging.warning(f"Initial JSON parsing failed: {e}")
+
+        # json-repair also handles truncated output, single quotes and
+        # trailing commas; anything that is not a JSON object or array
+        # means the output could not be recovered
+        if repair_json is not None:
+            try:
+                parsed = repair_json(strip_code_fence(json_string), return_objects=True)
+            except Exception as e:
+                logging.error(f"JSON repair failed: {e}")
+                return False, str(e)
+            if parsed and isinstance(parsed, (dict, list)):
+                logging.info("JSON repair resolved parsing issues")
+                return True, parsed
+            logging.error("JSON repair found no JSON object in the output")
+            return False, "no JSON object found"
         
         # Try sanitizing
         sanitized = sanitize_json_string(json_string)
         try:
-            parsed = json.loads(sanitized)
+            parsed = json_loads(sanitized)
             logging.info("JSON sanitization resolved parsing issues")
             return True, parsed
         except json.JSONDecodeError as e:
             logging.error(f"JSON parsing still failed after sanitization: {e}")
             return False, str(e)
 
-def group_and_summarize(articles, group_model, summarize_model, openai_api_key):
+def dedupe_articles(articles):
     """
-    Groups articles by topic and generates summaries using OpenAI's Chat API, preserving hyperlinks.
+    Drops articles whose title repeats an earlier one, ignoring case, spacing and punctuation.
 
     Parameters:
-        articles (list): List of filtered article dictionaries.
+        articles (list): Article dictionaries.
+
+    Returns:
+        list: The first article with each title, in the original order.
+    """
+    seen = set()
+    unique_articles = []
+    for article in articles:
+        key = _NON_WORD_RE.sub("", str(article.get("title") or "").lower())
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        unique_articles.append(article)
+    return unique_articles
+
+def chunk_articles(articles, chunk_size=GROUP_CHUNK_SIZE):
+    """Split articles into smaller chunks to avoid token limits."""
+    return [articles[i:i + chunk_size] for i in range(0, len(articles), chunk_size)]
+
+def dedupe_topic_articles(topic):
+    """
+    Drops articles a topic lists more than once, updating the topic in place.
+
+    Parameters:
+        topic (dict): Topic group whose articles are title and link dictionaries.
+    """
+    seen = set()
+    unique_articles = []
+    for article in topic.get("articles", []):
+        key = (article.get("title"), article.get("link"))
+        if key not in seen:
+            seen.add(key)
+            unique_articles.append(article)
+    topic["articles"] = unique_articles
+
+def is_reasoning_model(model):
+    """Returns whether model is a reasoning model such as gpt-5 or the o-series."""
+    return model.startswith(_REASONING_MODEL_PREFIXES)
+
+def response_format_for(model, schema):
+    """
+    Returns the response format requesting output that matches schema.
+
+    Parameters:
+        model (str): Model name.
+        schema (dict): json_schema definition such as GROUP_SCHEMA.
+
+    Returns:
+        dict: A json_schema response format, or JSON mode for models known not to support structured outputs.
+    """
+    if model in _JSON_SCHEMA_UNSUPPORTED:
+        return {"type": "json_object"}
+    return {"type": "json_schema", "json_schema": schema}
+
+def create_json_completion(client, request):
+    """
+    Calls the Chat Completions API, retrying in JSON mode if the model rejects structured outputs.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        request (dict): Keyword arguments for client.chat.completions.create.
+
+    Returns:
+        The chat completion response.
+    """
+    try:
+        return client.chat.completions.create(**request)
+    except BadRequestError as e:
+        if request.get("response_format", {}).get("type") != "json_schema" or "response_format" not in str(e):
+            raise
+        logging.warning(f"Model {request['model']} does not support structured outputs, using JSON mode: {e}")
+        _JSON_SCHEMA_UNSUPPORTED.add(request["model"])
+        return client.chat.completions.create(**{**request, "response_format": {"type": "json_object"}})
+
+def build_group_request(article_chunk, group_model):
+    """
+    Builds the chat completion arguments for grouping one chunk of articles.
+
+    Parameters:
+        article_chunk (list): Article dictionaries to group.
         group_model (str): Model name for grouping articles.
-        summarize_model (str): Model name for summarizing groups.
-        openai_api_key (str): API key for OpenAI.
 
     Returns:
-        summary (dict): A structured JSON-like dict with topic groups, summaries, and article links.
+        dict: Keyword arguments for client.chat.completions.create.
     """
-    client = OpenAI(api_key=openai_api_key)
+    # Ensure each article includes its hyperlink; the chunk is encoded in one
+    # call so titles and links arrive already escaped for the JSON reply
+    articles_text = json_dumps([{"title": a.get("title"), "link": a.get("link")} for a in article_chunk])
 
-    if not articles:
-        return {"topics": []}
-        
-    # Instead of sending all articles at once, let's chunk them to avoid token limits
-    def chunk_articles(articles_list, chunk_size=10):
-        """Split articles into smaller chunks to avoid token limits."""
-        for i in range(0, len(articles_list), chunk_size):
-            yield articles_list[i:i + chunk_size]
-    
-    # Group articles by topic using a more resilient approach
-    all_topics = []
-    
-    # Process articles in smaller batches
-    for chunk_index, article_chunk in enumerate(chunk_articles(articles, 10)):
-        logging.info(f"Processing article chunk {chunk_index+1}")
-        
-        # Ensure each article includes its hyperlink
-        articles_text = "\n\n".join([
-            f"Title: {json.dumps(a.get('title'))}, Link: {json.dumps(a.get('link'))}" 
-            for a in article_chunk
-        ])
-
-        # Request OpenAI to group articles - with simpler prompt focused on correctness
-        group_prompt = f"""
+    # Request OpenAI to group articles - with simpler prompt focused on correctness
+    group_prompt = f"""
 Group these articles into topics. Return ONLY valid JSON in this exact format:
 {{
     "topics": [
@@ -125,87 +331,179 @@ IMPORTANT:
 - No comments, no explanations
 - No code blocks or markup
 
-Articles:
+Articles (JSON array):
 {articles_text}
 """
 
+    if is_reasoning_model(group_model):
+        group_max_tokens = GROUP_MAX_TOKENS
+    else:
+        group_max_tokens = min(GROUP_MAX_TOKENS, GROUP_BASE_TOKENS + GROUP_TOKENS_PER_ARTICLE * len(article_chunk))
+
+    return {
+        "model": group_model,
+        "messages": [
+            {"role": "system", "content": "You are a JSON formatting expert that groups news articles into topics. Return ONLY valid JSON. Use EXACT titles and links from the input - do not modify or paraphrase them."},
+            {"role": "user", "content": group_prompt}
+        ],
+        "max_completion_tokens": group_max_tokens,
+        "response_format": response_format_for(group_model, GROUP_SCHEMA)
+    }
+
+def fallback_group(chunk_index, article_chunk):
+    """Returns the topic holding a chunk's raw articles, used when the chunk could not be grouped."""
+    return {
+        "topic": f"Articles Group {chunk_index+1}",
+        "articles": [{"title": a.get("title"), "link": a.get("link")} for a in article_chunk]
+    }
+
+def parse_group_output(group_raw_output, chunk_index):
+    """
+    Parses a grouping response into topics.
+
+    Parameters:
+        group_raw_output (str): Raw model output.
+        chunk_index (int): Position of the chunk, used in log messages.
+
+    Returns:
+        list: Topic groups, or None if the output cannot be parsed.
+    """
+    # validate_json parses well-formed output directly and only repairs it
+    # when that fails
+    is_valid, result = validate_json(group_raw_output)
+    if is_valid and isinstance(result, dict):
+        return result.get("topics", [])
+
+    logging.error(f"JSON validation failed for chunk {chunk_index+1}: {result}")
+    return None
+
+def group_chunk(client, chunk_index, article_chunk, group_model, fallback_model=None, cache=None):
+    """
+    Groups one chunk of articles into topics.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        chunk_index (int): Position of the chunk, used in log messages and fallback topic names.
+        article_chunk (list): Article dictionaries to group.
+        group_model (str): Model name for grouping articles.
+        fallback_model (str): Optional model that regroups the chunk if group_model
+            fails or returns output that cannot be parsed.
+        cache (LLMCache): Optional cache of earlier groupings; an identical
+            request reuses its topics instead of calling the API.
+
+    Returns:
+        list: Topic groups; a single fallback group holding every article if grouping fails.
+    """
+    logging.info(f"Processing article chunk {chunk_index+1}")
+
+    models = [group_model]
+    if fallback_model and fallback_model != group_model:
+        models.append(fallback_model)
+
+    for model in models:
+        group_request = build_group_request(article_chunk, model)
+
+        if cache is not None:
+            # Keyed on the request for the chunk in a fixed order, so the same
+            # articles arriving in a different order reuse the grouping
+            sorted_chunk = sorted(article_chunk, key=lambda a: (str(a.get("title")), str(a.get("link"))))
+            key_request = build_group_request(sorted_chunk, model)
+            group_key = LLMCache.make_key("group", model, *(m["content"] for m in key_request["messages"]))
+            cached_topics = cache.get(group_key)
+            if cached_topics is not None:
+                return cached_topics
+
         try:
-            group_response = client.chat.completions.create(
-                model=group_model,
-                messages=[
-                    {"role": "system", "content": "You are a JSON formatting expert that groups news articles into topics. Return ONLY valid JSON. Use EXACT titles and links from the input - do not modify or paraphrase them."},
-                    {"role": "user", "content": group_prompt}
-                ],
-                max_completion_tokens=2000,  # Increased token limit
-                response_format={"type": "json_object"}  # Enforce JSON response format if available
-            )
+            group_response = create_json_completion(client, group_request)
 
             # Extract the raw output
             group_raw_output = group_response.choices[0].message.content.strip()
-            
-            # Try to parse the JSON response
-            try:
-                chunk_result = json.loads(group_raw_output)
-                # If successful, add topics to our collection
-                all_topics.extend(chunk_result.get("topics", []))
-            except json.JSONDecodeError as e:
-                logging.error(f"JSON parsing failed for chunk {chunk_index+1}: {e}")
-                # Try our repair function
-                is_valid, result = validate_json(group_raw_output)
-                if is_valid:
-                    all_topics.extend(result.get("topics", []))
-                else:
-                    logging.error(f"JSON validation also failed: {result}")
-                    # Create a fallback topic with the raw articles
-                    fallback_topic = {
-                        "topic": f"Articles Group {chunk_index+1}",
-                        "articles": [{"title": a.get("title"), "link": a.get("link")} for a in article_chunk]
-                    }
-                    all_topics.append(fallback_topic)
+            topics = parse_group_output(group_raw_output, chunk_index)
+            if topics is not None:
+                if cache is not None:
+                    cache.set(group_key, topics)
+                return topics
+            logging.error(f"Unusable grouping output for chunk {chunk_index+1} from {model}")
 
         except Exception as e:
-            logging.error(f"LLM grouping error for chunk {chunk_index+1}: {e}")
-            # Create a fallback topic with the raw articles even on API failure
-            fallback_topic = {
-                "topic": f"Articles Group {chunk_index+1}",
-                "articles": [{"title": a.get("title"), "link": a.get("link")} for a in article_chunk]
-            }
-            all_topics.append(fallback_topic)
-    
-    # Combine all topics into one structure
-    groups = {"topics": all_topics}
+            logging.error(f"LLM grouping error for chunk {chunk_index+1} with {model}: {e}")
 
-    # Process each topic and generate a summary
-    for topic in groups.get("topics", []):
-        articles_in_topic = topic.get("articles", [])
-        
-        # Match articles in the topic with full article data
-        relevant_articles = []
-        for article in articles_in_topic:
-            # Try to find the matching article with full data
-            matching_article = next((a for a in articles if a.get("title") == article.get("title")), None)
-            if matching_article:
-                relevant_articles.append(matching_article)
-            else:
-                # Use the limited data we have
-                relevant_articles.append({
-                    "title": article.get("title", ""),
-                    "link": article.get("link", ""),
-                    "summary": "No detailed summary available."
-                })
-        
-        # If no articles with full data were found, skip summarization
-        if not relevant_articles:
-            topic["summary"] = "No articles available for summarization."
-            continue
+    return [fallback_group(chunk_index, article_chunk)]
 
-        # Create a combined text for summarization
-        combined_text = "\n\n".join([
-            f"Title: {a.get('title')}" + (f", Summary: {a.get('summary')}" if a.get('summary') else "") 
-            for a in relevant_articles[:5]  # Limit to 5 articles to avoid token limits
-        ])
+def topic_source_text(topic, articles_by_title):
+    """
+    Builds the article text a topic summary is written from.
+
+    Parameters:
+        topic (dict): Topic group with "topic" and "articles" keys.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+
+    Returns:
+        str: Titles and summaries, cut to SUMMARY_CHAR_CAP characters, of up to five
+            of the topic's articles, or None if the topic has no articles.
+    """
+    # Limit to 5 articles to avoid token limits
+    articles_in_topic = topic.get("articles", [])[:5]
+
+    # If the topic has no articles, skip summarization
+    if not articles_in_topic:
+        return None
+
+    # Match articles in the topic with full article data, using the limited
+    # data we have for any that are not in the index
+    relevant_articles = [
+        articles_by_title.get(article.get("title")) or {
+            "title": article.get("title", ""),
+            "summary": "No detailed summary available."
+        }
+        for article in articles_in_topic
+    ]
 
-        summarize_prompt = f"""
+    # Create a combined text for summarization
+    return "\n\n".join([
+        f"Title: {a.get('title')}" + (f", Summary: {a.get('summary')[:SUMMARY_CHAR_CAP]}" if a.get('summary') else "")
+        for a in relevant_articles
+    ])
+
+def topic_cache_key(topic, articles_by_title, summarize_model):
+    """
+    Builds the summary cache key for a topic from the set of articles in it.
+
+    The topic name and article order are left out: grouping the same articles
+    again often names or orders them differently, and the summary depends on
+    the articles rather than on the label.
+
+    Parameters:
+        topic (dict): Topic group with "topic" and "articles" keys.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        summarize_model (str): Model name for summarizing groups.
+
+    Returns:
+        bytes: Cache key.
+    """
+    parts = []
+    for article in topic.get("articles", []):
+        full_article = articles_by_title.get(article.get("title")) or article
+        parts.append(f"{full_article.get('title')}\x1e{full_article.get('summary')}")
+    return LLMCache.make_key("topic", summarize_model, *sorted(parts))
+
+def build_summary_request(topic, articles_by_title, summarize_model):
+    """
+    Builds the chat completion arguments for summarizing one topic group.
+
+    Parameters:
+        topic (dict): Topic group with "topic" and "articles" keys.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        summarize_model (str): Model name for summarizing groups.
+
+    Returns:
+        dict: Keyword arguments for client.chat.completions.create, or None if the topic has no articles.
+    """
+    combined_text = topic_source_text(topic, articles_by_title)
+    if combined_text is None:
+        return None
+
+    summarize_prompt = f"""
 Write a single paragraph summary about {topic.get('topic')} based ONLY on these articles:
 
 {combined_text}
@@ -220,36 +518,531 @@ CRITICAL INSTRUCTIONS:
 
 Summary:"""
 
+    return {
+        "model": summarize_model,
+        "messages": [
+            {"role": "system", "content": SUMMARIZE_SYSTEM_PROMPT},
+            {"role": "user", "content": summarize_prompt}
+        ],
+        "max_completion_tokens": 400,
+    }
+
+def build_bundle_request(topics, articles_by_title, summarize_model):
+    """
+    Builds the chat completion arguments for summarizing several topic groups in one request.
+
+    Parameters:
+        topics (list): Topic groups, each with at least one article.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        summarize_model (str): Model name for summarizing groups.
+
+    Returns:
+        dict: Keyword arguments for client.chat.completions.create.
+    """
+    # Number the topics so each summary can be matched back even if two
+    # topics share a name
+    topics_text = "\n\n".join(
+        f"{n}. Topic: {topic.get('topic')}\n{topic_source_text(topic, articles_by_title)}"
+        for n, topic in enumerate(topics, 1)
+    )
+
+    summarize_prompt = f"""
+Write a single paragraph summary for each of the {len(topics)} topics below, based ONLY on the articles listed under that topic:
+
+{topics_text}
+
+CRITICAL INSTRUCTIONS:
+- Use ONLY information explicitly stated in each topic's articles
+- Do NOT add any information not present in the source material
+- Do NOT invent specific numbers, dates, locations, or names
+- If details are missing, use general terms like "multiple", "several", "recently" 
+- Combine the facts into a flowing narrative paragraph (no lists or bullet points)
+- Focus on what IS stated rather than speculating about what might be
+
+Return ONLY valid JSON with one entry per topic number, in this exact format:
+{{"summaries": [{{"id": 1, "summary": "Summary paragraph"}}]}}
+"""
+
+    return {
+        "model": summarize_model,
+        "messages": [
+            {"role": "system", "content": SUMMARIZE_SYSTEM_PROMPT},
+            {"role": "user", "content": summarize_prompt}
+        ],
+        "max_completion_tokens": 400 * len(topics),
+        "response_format": response_format_for(summarize_model, SUMMARY_SCHEMA)
+    }
+
+def parse_bundle_output(raw_output, topic_count):
+    """
+    Parses a bundled summary response.
+
+    Parameters:
+        raw_output (str): Raw model output.
+        topic_count (int): Number of topics in the request.
+
+    Returns:
+        list: Summary text for each topic in request order; None where the response has none.
+    """
+    summaries = [None] * topic_count
+
+    is_valid, result = validate_json(raw_output)
+    if not is_valid or not isinstance(result, dict):
+        return summaries
+
+    for item in result.get("summaries", []):
+        if not isinstance(item, dict):
+            continue
+        topic_id, summary_text = item.get("id"), item.get("summary")
+        if isinstance(topic_id, int) and 1 <= topic_id <= topic_count and isinstance(summary_text, str):
+            summaries[topic_id - 1] = summary_text.strip() or None
+
+    return summaries
+
+def own_summary(topic, articles_by_title):
+    """
+    Returns the feed summary of a single-article topic, to use in place of a generated one.
+
+    Parameters:
+        topic (dict): Topic group with "topic" and "articles" keys.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+
+    Returns:
+        str: The article's summary as plain text, or None if the topic has several
+            articles or the summary is missing or longer than SUMMARY_CHAR_CAP.
+    """
+    articles_in_topic = topic.get("articles", [])
+    if len(articles_in_topic) != 1:
+        return None
+
+    article = articles_by_title.get(articles_in_topic[0].get("title")) or {}
+    text = html.unescape(_HTML_TAG_RE.sub(" ", article.get("summary") or ""))
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+
+    # A long summary would have to be cut mid-sentence; let the model condense it
+    if not text or len(text) > SUMMARY_CHAR_CAP:
+        return None
+    return text
+
+def fallback_summary(topic):
+    """Returns the generic description used when a topic could not be summarized."""
+    return f"A collection of {len(topic.get('articles', []))} articles about {topic.get('topic')}."
+
+def apply_summary(topic, summary_text):
+    """
+    Stores a generated summary on a topic group, cleaning up its formatting.
+
+    Parameters:
+        topic (dict): Topic group to update in place.
+        summary_text (str): Model output; a generic description is used if it is empty.
+    """
+    articles_in_topic = topic.get("articles", [])
+
+    # Debug logging
+    logging.info(f"Summarization response for '{topic.get('topic')}': {len(summary_text)} chars")
+    if not summary_text:
+        logging.error(f"Summarization API returned an empty response for topic: {topic.get('topic')}")
+        summary_text = fallback_summary(topic)
+    else:
+        logging.info(f"Summary preview: {summary_text[:100]}...")
+
+    # Clean up summary to remove any markdown formatting
+    summary_text = _SUMMARY_LABEL_RE.sub('', summary_text)
+    summary_text = _NEWLINES_RE.sub(' ', summary_text)
+    
+    topic["summary"] = summary_text
+    topic["articles"] = [{"title": a.get("title", "Untitled"), "link": a.get("link", "#")} for a in articles_in_topic]
+
+def summarize_topic(client, topic, articles_by_title, summarize_model):
+    """
+    Generates a summary for one topic group, updating the topic in place.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        topic (dict): Topic group with "topic" and "articles" keys.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        summarize_model (str): Model name for summarizing groups.
+    """
+    summarize_request = build_summary_request(topic, articles_by_title, summarize_model)
+    if summarize_request is None:
+        topic["summary"] = "No articles available for summarization."
+        return
+
+    try:
+        summarize_response = client.chat.completions.create(**summarize_request)
+
+        summary_text = summarize_response.choices[0].message.content.strip() if summarize_response.choices else ""
+        if not summary_text:
+            logging.error(f"Response object: {summarize_response}")
+
+        apply_summary(topic, summary_text)
+
+    except Exception as e:
+        logging.error(f"LLM summarization error for topic '{topic.get('topic')}': {e}")
+        topic["summary"] = fallback_summary(topic)
+
+def summarize_bundle(client, topics, articles_by_title, summarize_model):
+    """
+    Generates summaries for several topic groups in one request, updating the topics in place.
+
+    Topics the response leaves without a summary are summarized one at a time.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        topics (list): Topic groups, each with at least one article.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        summarize_model (str): Model name for summarizing groups.
+    """
+    if len(topics) == 1:
+        summarize_topic(client, topics[0], articles_by_title, summarize_model)
+        return
+
+    try:
+        summarize_response = create_json_completion(client, build_bundle_request(topics, articles_by_title, summarize_model))
+        raw_output = summarize_response.choices[0].message.content.strip() if summarize_response.choices else ""
+        summaries = parse_bundle_output(raw_output, len(topics))
+    except Exception as e:
+        logging.error(f"LLM summarization error for a bundle of {len(topics)} topics: {e}")
+        summaries = [None] * len(topics)
+
+    for topic, summary_text in zip(topics, summaries):
+        if summary_text:
+            apply_summary(topic, summary_text)
+        else:
+            summarize_topic(client, topic, articles_by_title, summarize_model)
+
+def run_batch(client, requests, poll_interval=BATCH_POLL_INTERVAL, max_wait=BATCH_MAX_WAIT):
+    """
+    Runs chat completion requests through the OpenAI Batch API and waits for the results.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        requests (dict): Keyword arguments for client.chat.completions.create, keyed by custom ID.
+        poll_interval (float): Seconds before the first status check; the interval
+            doubles after each check, up to BATCH_MAX_POLL_INTERVAL.
+        max_wait (float): Seconds to wait before cancelling the batch.
+
+    Returns:
+        dict: Response text keyed by custom ID; requests that failed are missing.
+    """
+    batch_input = "\n".join(
+        json_dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+        for custom_id, body in requests.items()
+    )
+    input_file = client.files.create(file=("batch_input.jsonl", batch_input.encode("utf-8")), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logging.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+
+    deadline = time.time() + max_wait
+    while batch.status not in _BATCH_FINAL_STATES:
+        if time.time() > deadline:
+            client.batches.cancel(batch.id)
+            raise TimeoutError(f"Batch {batch.id} did not finish within {max_wait} seconds")
+        time.sleep(min(poll_interval, max(deadline - time.time(), 0)))
+        batch = client.batches.retrieve(batch.id)
+        poll_interval = min(poll_interval * 2, BATCH_MAX_POLL_INTERVAL)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    # Results arrive in any order; custom_id routes each one back to its request
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        result = json_loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            logging.error(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+            continue
+        choices = response.get("body", {}).get("choices") or []
+        results[result["custom_id"]] = (choices[0]["message"].get("content") or "").strip() if choices else ""
+
+    return results
+
+def group_chunks(client, chunks, group_model, use_batch=False, fallback_model=None, cache=None, max_workers=None):
+    """
+    Groups chunks of articles into topics.
+
+    With use_batch, chunks the batch returns no usable grouping for are
+    regrouped in real time.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        chunks (list): Lists of article dictionaries.
+        group_model (str): Model name for grouping articles.
+        use_batch (bool): Submit the requests through the Batch API, falling back to real-time requests on failure.
+        fallback_model (str): Optional model that regroups a chunk in real time if group_model fails.
+        cache (LLMCache): Optional cache of earlier real-time groupings.
+        max_workers (int): Concurrent real-time requests (default: MAX_GROUP_WORKERS).
+
+    Returns:
+        list: Topic groups in chunk order.
+    """
+    chunk_topics = [None] * len(chunks)
+
+    if use_batch:
         try:
-            summarize_response = client.chat.completions.create(
-                model=summarize_model,
-                messages=[
-                    {"role": "system", "content": "You are a fact-based news summarizer. You MUST use ONLY information explicitly provided in the source articles. Never add details, numbers, or facts not present in the sources. If information is missing, use general terms rather than inventing specifics."},
-                    {"role": "user", "content": summarize_prompt}
-                ],
-                max_completion_tokens=400,
+            results = run_batch(client, {
+                f"grp-{chunk_index}": build_group_request(article_chunk, group_model)
+                for chunk_index, article_chunk in enumerate(chunks)
+            })
+            for chunk_index in range(len(chunks)):
+                group_raw_output = results.get(f"grp-{chunk_index}")
+                if group_raw_output is not None:
+                    chunk_topics[chunk_index] = parse_group_output(group_raw_output, chunk_index)
+        except Exception as e:
+            logging.error(f"Batch API grouping failed, using real-time requests: {e}")
+
+    # Group the chunks the batch left out, or all of them, in real time, with
+    # the fallback model and the cache; topics keep the order of their chunks
+    pending = [chunk_index for chunk_index, topics in enumerate(chunk_topics) if topics is None]
+    if use_batch and 0 < len(pending) < len(chunks):
+        logging.info(f"Regrouping {len(pending)} chunks the batch did not group in real time")
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(max_workers or MAX_GROUP_WORKERS, len(pending))) as executor:
+            regrouped = executor.map(
+                lambda index: group_chunk(client, index, chunks[index], group_model, fallback_model, cache),
+                pending
             )
+            for chunk_index, topics in zip(pending, regrouped):
+                chunk_topics[chunk_index] = topics
+
+    return [topic for topics in chunk_topics for topic in topics]
+
+def summarize_topics(client, topics, articles_by_title, summarize_model, use_batch=False, cache=None,
+                     max_workers=None, executor=None):
+    """
+    Generates a summary for each topic group, updating the topics in place.
+
+    Topics are summarized in bundles of up to SUMMARY_BUNDLE_SIZE per request.
 
-            summary_text = summarize_response.choices[0].message.content.strip() if summarize_response.choices else ""
-            
-            # Debug logging
-            logging.info(f"Summarization response for '{topic.get('topic')}': {len(summary_text)} chars")
-            if not summary_text:
-                logging.error(f"Summarization API returned an empty response for topic: {topic.get('topic')}")
-                logging.error(f"Response object: {summarize_response}")
-                summary_text = f"A collection of {len(articles_in_topic)} articles about {topic.get('topic')}."
+    Parameters:
+        client (OpenAI): OpenAI client.
+        topics (list): Topic groups.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        summarize_model (str): Model name for summarizing groups.
+        use_batch (bool): Submit the requests through the Batch API, falling back to real-time requests on failure.
+        cache (LLMCache): Optional cache of earlier summaries, keyed by the content of a
+            topic's articles only; topics with the same articles share a summary
+            whatever their name, instead of calling the API.
+        max_workers (int): Concurrent real-time requests (default: MAX_SUMMARY_WORKERS).
+        executor (ThreadPoolExecutor): Optional pool shared with other requests; the
+            bundles are submitted to it instead of a pool of their own, and the
+            function returns without waiting for them.
+
+    Returns:
+        list: Futures of the bundles submitted to executor; empty if executor is not given.
+    """
+    # Topics without articles, or with a single article that has a short
+    # summary of its own, need no request; a model sometimes lists the same
+    # article twice in one topic
+    pending = []
+    skipped = 0
+    for topic in topics:
+        dedupe_topic_articles(topic)
+        if not topic.get("articles"):
+            topic["summary"] = "No articles available for summarization."
+            continue
+
+        summary_text = own_summary(topic, articles_by_title)
+        if summary_text:
+            apply_summary(topic, summary_text)
+            skipped += 1
+        else:
+            pending.append(topic)
+
+    if skipped:
+        logging.info(f"Used the article's own summary for {skipped} single-article topics")
+
+    # Cache keys by topic identity; apply_summary rewrites a topic's articles,
+    # so the keys are computed before any summary is stored
+    keys = {}
+    if cache is not None and pending:
+        pending_keys = [topic_cache_key(topic, articles_by_title, summarize_model) for topic in pending]
+        cached = cache.get_many(pending_keys)
+        logging.info(f"Summary cache: {len(cached)} of {len(pending)} topics already summarized")
+
+        misses = []
+        for key, topic in zip(pending_keys, pending):
+            if key in cached:
+                apply_summary(topic, cached[key])
             else:
-                logging.info(f"Summary preview: {summary_text[:100]}...")
+                keys[id(topic)] = key
+                misses.append(topic)
+        pending = misses
+
+    def store_summaries(summarized_topics):
+        """Caches new summaries; fallback descriptions are not cached so the next run retries them."""
+        if cache is not None:
+            cache.set_many({
+                keys[id(topic)]: topic["summary"]
+                for topic in summarized_topics if topic.get("summary") != fallback_summary(topic)
+            })
+
+    def summarize_and_store(bundle):
+        """Summarizes one bundle and caches the results."""
+        summarize_bundle(client, bundle, articles_by_title, summarize_model)
+        store_summaries(bundle)
 
-            # Clean up summary to remove any markdown formatting
-            summary_text = re.sub(r'^[#*"\s]*(Summary:|Topic:|Articles:)\s*', '', summary_text)
-            summary_text = re.sub(r'\n+', ' ', summary_text)
-            
-            topic["summary"] = summary_text
-            topic["articles"] = [{"title": a.get("title", "Untitled"), "link": a.get("link", "#")} for a in articles_in_topic]
+    bundles = [pending[i:i + SUMMARY_BUNDLE_SIZE] for i in range(0, len(pending), SUMMARY_BUNDLE_SIZE)]
 
+    if use_batch and bundles:
+        try:
+            results = run_batch(client, {
+                f"sum-{bundle_index}": build_bundle_request(bundle, articles_by_title, summarize_model)
+                for bundle_index, bundle in enumerate(bundles)
+            })
+            summarized = []
+            missing = []
+            for bundle_index, bundle in enumerate(bundles):
+                summaries = parse_bundle_output(results.get(f"sum-{bundle_index}", ""), len(bundle))
+                for topic, summary_text in zip(bundle, summaries):
+                    if summary_text:
+                        apply_summary(topic, summary_text)
+                        summarized.append(topic)
+                    else:
+                        missing.append(topic)
+            store_summaries(summarized)
+            # Summarize whatever the batch left out one topic at a time
+            bundles = [[topic] for topic in missing]
         except Exception as e:
-            logging.error(f"LLM summarization error for topic '{topic.get('topic')}': {e}")
-            topic["summary"] = f"A collection of {len(articles_in_topic)} articles about {topic.get('topic')}."
+            logging.error(f"Batch API summarization failed, using real-time requests: {e}")
+
+    if executor is not None:
+        return [executor.submit(summarize_and_store, bundle) for bundle in bundles]
+
+    if bundles:
+        # Summarize the bundles concurrently; each request is network-bound
+        with ThreadPoolExecutor(max_workers=min(max_workers or MAX_SUMMARY_WORKERS, len(bundles))) as bundle_executor:
+            list(bundle_executor.map(summarize_and_store, bundles))
+    return []
+
+def group_and_summarize_chunks(client, chunks, articles_by_title, group_model, summarize_model, cache=None,
+                               group_fallback_model=None, max_workers=None):
+    """
+    Groups chunks of articles into topics and summarizes them, starting on each
+    chunk's topics as soon as that chunk is grouped.
+
+    Grouping and summary requests share one pool, so no more than max_workers
+    requests are in flight at any time.
+
+    Parameters:
+        client (OpenAI): OpenAI client.
+        chunks (list): Lists of article dictionaries.
+        articles_by_title (dict): Full article dictionaries keyed by title.
+        group_model (str): Model name for grouping articles.
+        summarize_model (str): Model name for summarizing groups.
+        cache (LLMCache): Optional cache of earlier groupings and topic summaries.
+        group_fallback_model (str): Optional model that regroups a chunk if group_model fails.
+        max_workers (int): Concurrent requests (default: MAX_SUMMARY_WORKERS).
+
+    Returns:
+        list: Summarized topic groups in chunk order.
+    """
+    chunk_topics = [[] for _ in chunks]
+    summary_futures = []
+
+    with ThreadPoolExecutor(max_workers=max_workers or MAX_SUMMARY_WORKERS) as executor:
+        group_futures = {
+            executor.submit(
+                group_chunk, client, chunk_index, article_chunk, group_model, group_fallback_model, cache
+            ): chunk_index
+            for chunk_index, article_chunk in enumerate(chunks)
+        }
+        # Topic preparation and cache lookups run here; only the summary
+        # requests themselves go to the pool
+        for future in as_completed(group_futures):
+            topics = future.result()
+            chunk_topics[group_futures[future]] = topics
+            summary_futures.extend(summarize_topics(
+                client, topics, articles_by_title, summarize_model, cache=cache, executor=executor
+            ))
+
+        for future in summary_futures:
+            future.result()
+
+    return [topic for topics in chunk_topics for topic in topics]
+
+def group_and_summarize(articles, group_model, summarize_model, openai_api_key, use_batch=False, cache=None,
+                        group_fallback_model=None, max_workers=None):
+    """
+    Groups articles by topic and generates summaries using OpenAI's Chat API, preserving hyperlinks.
+
+    Parameters:
+        articles (list): List of filtered article dictionaries.
+        group_model (str): Model name for grouping articles.
+        summarize_model (str): Model name for summarizing groups.
+        openai_api_key (str): API key for OpenAI.
+        use_batch (bool): Use the OpenAI Batch API, which costs half as much but may take much longer.
+        cache (LLMCache): Optional cache of earlier results; an unchanged article set
+            reuses its digest, unchanged chunks reuse their grouping, and topics
+            with the same articles reuse their summaries whatever their name.
+        group_fallback_model (str): Optional model that regroups a chunk when group_model
+            fails, so a small, cheap group_model can be used.
+        max_workers (int): Maximum concurrent OpenAI requests (default: MAX_GROUP_WORKERS
+            for grouping and MAX_SUMMARY_WORKERS for summaries).
+
+    Returns:
+        summary (dict): A structured JSON-like dict with topic groups, summaries, and article links.
+    """
+    client = get_openai_client(openai_api_key)
+
+    if not articles:
+        return {"topics": []}
+
+    # The same story syndicated across feeds only needs grouping once
+    unique_articles = dedupe_articles(articles)
+    if len(unique_articles) < len(articles):
+        logging.info(f"Dropped {len(articles) - len(unique_articles)} articles with duplicate titles")
+        articles = unique_articles
+
+    if cache is not None:
+        digest_key = LLMCache.make_key(
+            "digest", group_model, summarize_model,
+            *sorted(f"{a.get('title')}\x1e{a.get('link')}\x1e{a.get('summary')}" for a in articles)
+        )
+        cached_groups = cache.get(digest_key)
+        if cached_groups is not None:
+            logging.info(f"Summary cache: reusing digest of {len(articles)} articles")
+            return cached_groups
+
+    # Index articles by title so topics can be matched back in constant time;
+    # the first article with a given title wins, as with a linear search
+    articles_by_title = {}
+    for article in articles:
+        articles_by_title.setdefault(article.get("title"), article)
+
+    # Instead of sending all articles at once, chunk them to avoid token limits
+    chunks = chunk_articles(articles)
+
+    if use_batch:
+        # Group articles by topic, then process each topic and generate a summary
+        all_topics = group_chunks(client, chunks, group_model, use_batch, group_fallback_model, cache, max_workers)
+        summarize_topics(client, all_topics, articles_by_title, summarize_model, use_batch, cache, max_workers)
+    else:
+        all_topics = group_and_summarize_chunks(
+            client, chunks, articles_by_title, group_model, summarize_model, cache, group_fallback_model,
+            max_workers
+        )
+    
+    # Combine all topics into one structure
+    groups = {"topics": all_topics}
+
+    # Digests built from fallback groups or summaries are not cached so the
+    # next run retries them
+    if cache is not None and not any(
+        str(topic.get("topic")).startswith("Articles Group ") or topic.get("summary") == fallback_summary(topic)
+        for topic in groups["topics"]
+    ):
+        cache.set(digest_key, groups)
+
+    if cache is not None:
+        logging.info(f"Summary cache: {cache.hits} hits, {cache.misses} misses")
 
-    return groups
\ No newline at end of file
+    return groups
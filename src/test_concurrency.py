@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# src/test_concurrency.py
+
+import re
+import time
+import threading
+from types import SimpleNamespace
+import summarizer
+
+class FakeCompletions:
+    """Answers grouping and summary requests after a short delay, recording the peak number in flight."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, **request):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            prompt = request["messages"][-1]["content"]
+            if "Articles (JSON array):" in prompt:
+                articles = summarizer.json_loads(prompt.split("Articles (JSON array):", 1)[1])
+                content = summarizer.json_dumps({
+                    "topics": [{"topic": a["title"], "articles": [a]} for a in articles]
+                })
+            else:
+                topic_ids = re.findall(r'^(\d+)\. Topic:', prompt, re.M)
+                content = summarizer.json_dumps({
+                    "summaries": [{"id": int(n), "summary": "Summary."} for n in topic_ids]
+                })
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+def run_with_fake_client(max_workers):
+    """Groups and summarizes 80 articles with a fake client and returns its completions."""
+    completions = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    # Summaries longer than SUMMARY_CHAR_CAP, so every topic needs a request
+    articles = [
+        {"title": f"Story {i}", "link": f"https://example.com/{i}", "summary": "x" * (summarizer.SUMMARY_CHAR_CAP + 1)}
+        for i in range(80)
+    ]
+
+    original_get_client = summarizer.get_openai_client
+    summarizer.get_openai_client = lambda api_key: client
+    try:
+        result = summarizer.group_and_summarize(articles, "gpt-4o-mini", "gpt-4o-mini", "test-key", max_workers=max_workers)
+    finally:
+        summarizer.get_openai_client = original_get_client
+
+    assert len(result["topics"]) == len(articles)
+    assert all(topic["summary"] == "Summary." for topic in result["topics"])
+    return completions
+
+def test_concurrency_limit():
+    """Grouping and summary requests together never exceed max_workers in flight."""
+    completions = run_with_fake_client(max_workers=4)
+    assert completions.calls == 8 + 16, completions.calls
+    assert completions.peak <= 4, f"{completions.peak} requests in flight with max_workers=4"
+
+def test_default_concurrency_limit():
+    """Without max_workers, requests in flight stay within the default pool size."""
+    completions = run_with_fake_client(max_workers=None)
+    limit = max(summarizer.MAX_GROUP_WORKERS, summarizer.MAX_SUMMARY_WORKERS)
+    assert completions.peak <= limit, f"{completions.peak} requests in flight with the default limit of {limit}"
+
+if __name__ == "__main__":
+    test_concurrency_limit()
+    test_default_concurrency_limit()
+    print("Concurrency limit test passed")
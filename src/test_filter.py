@@ -4,9 +4,8 @@
 import json
 import os
 import logging
-from dotenv import dotenv_values
-from llm_filter import filter_stories
-from utils import setup_logger
+from llm_filter import classify_stories
+from utils import setup_logger, load_env
 
 def load_test_articles():
     """Load test articles from the test dataset."""
@@ -25,7 +24,7 @@ def run_filter_test(verbose=False):
     logger.info("Starting filter test...")
     
     # Load environment variables
-    env_vars = dotenv_values(".env")
+    env_vars = load_env()
     openai_api_key = env_vars.get("OPENAI_API_KEY")
     filter_prompt = env_vars.get("FILTER_PROMPT", "")
     filter_model = env_vars.get("FILTER_MODEL", "gpt-4-turbo")
@@ -48,6 +47,12 @@ def run_filter_test(verbose=False):
     
     logger.info(f"Test dataset: {len(should_pass)} should pass, {len(should_reject)} should be rejected")
     
+    # Classify every test article in batched requests; decisions come back in
+    # article order
+    decisions = classify_stories(should_pass + should_reject, filter_prompt, filter_model, openai_api_key)
+    pass_decisions = decisions[:len(should_pass)]
+    reject_decisions = decisions[len(should_pass):]
+    
     # Test articles that should pass
     print("\n" + "="*80)
     print("TESTING ARTICLES THAT SHOULD PASS")
@@ -56,12 +61,8 @@ def run_filter_test(verbose=False):
     passed_correctly = []
     failed_to_pass = []
     
-    for article in should_pass:
-        # Create a single-item list for the filter function
-        test_list = [article]
-        filtered = filter_stories(test_list, filter_prompt, filter_model, openai_api_key)
-        
-        if len(filtered) > 0:
+    for article, decision in zip(should_pass, pass_decisions):
+        if decision:
             passed_correctly.append(article)
             result = "✅ PASS"
         else:
@@ -81,12 +82,8 @@ def run_filter_test(verbose=False):
     rejected_correctly = []
     failed_to_reject = []
     
-    for article in should_reject:
-        # Create a single-item list for the filter function
-        test_list = [article]
-        filtered = filter_stories(test_list, filter_prompt, filter_model, openai_api_key)
-        
-        if len(filtered) == 0:
+    for article, decision in zip(should_reject, reject_decisions):
+        if not decision:
             rejected_correctly.append(article)
             result = "✅ REJECT"
         else:
@@ -2,16 +2,21 @@
 # src/test_summarization.py
 
 import json
-from dotenv import dotenv_values
+import re
 from summarizer import group_and_summarize
-from utils import setup_logger
+from utils import setup_logger, load_env
+
+# Markers of list-style summaries: numbered items, bullets, dashes starting
+# an item, or an "Articles:" heading. An item number must start a word and
+# not continue a number, so "$1.5", "7.1." and "M6.2." are not items
+_LIST_FORMAT_RE = re.compile(r'(?<![\w.$])[12]\.(?!\d)|•|- |Articles:')
 
 def test_summarization():
     """Test the new summarization prompt with sample articles."""
     logger = setup_logger()
     
     # Load environment variables
-    env_vars = dotenv_values(".env")
+    env_vars = load_env()
     openai_api_key = env_vars.get("OPENAI_API_KEY")
     group_model = env_vars.get("GROUP_MODEL", "gpt-4-turbo")
     summarize_model = env_vars.get("SUMMARIZE_MODEL", "gpt-4-turbo")
@@ -57,6 +62,9 @@ def test_summarization():
     print("RESULTS:")
     print("-" * 50)
     
+    narrative_count = 0
+    list_count = 0
+    
     for i, topic in enumerate(result.get("topics", []), 1):
         print(f"{i}. TOPIC: {topic.get('topic', 'Unknown Topic')}")
         print(f"   ARTICLES: {len(topic.get('articles', []))}")
@@ -65,13 +73,20 @@ def test_summarization():
         
         # Check if summary looks like the old list format
         summary_text = topic.get('summary', '')
-        if 'A collection of' in summary_text and 'articles about' in summary_text:
+        is_fallback = 'A collection of' in summary_text
+        is_list = bool(_LIST_FORMAT_RE.search(summary_text))
+        if is_fallback and 'articles about' in summary_text:
             print("   ⚠️  WARNING: Still using list format instead of narrative!")
-        elif 'Articles:' in summary_text or any(char in summary_text for char in ['1.', '2.', '•', '-']):
+        elif is_list:
             print("   ⚠️  WARNING: Contains list-like formatting!")
         else:
             print("   ✅ Appears to be narrative format")
         print()
+        
+        if is_fallback or is_list:
+            list_count += 1
+        else:
+            narrative_count += 1
     
     print("ANALYSIS:")
     print("-" * 50)
@@ -79,18 +94,6 @@ def test_summarization():
     if len(result.get("topics", [])) == 0:
         print("❌ No topics generated - check grouping functionality")
     else:
-        narrative_count = 0
-        list_count = 0
-        
-        for topic in result.get("topics", []):
-            summary_text = topic.get('summary', '')
-            if ('A collection of' in summary_text or 
-                'Articles:' in summary_text or 
-                any(char in summary_text for char in ['1.', '2.', '•', '-'])):
-                list_count += 1
-            else:
-                narrative_count += 1
-        
         print(f"Narrative summaries: {narrative_count}")
         print(f"List-format summaries: {list_count}")
         
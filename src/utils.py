@@ -1,7 +1,26 @@
 # src/utils.py
 
 import os
+import re
+import json
 import logging
+import functools
+from dotenv import dotenv_values
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Retries of rate-limited, timed-out and 5xx OpenAI requests; the client
+# backs off exponentially with jitter and honours Retry-After
+OPENAI_MAX_RETRIES = 5
+
+# Parsed .env files by path, as (mtime, values)
+_env_cache = {}
+
+# Markdown code fence wrapped around a whole response, e.g. ```json ... ```
+_FENCE_RE = re.compile(r'^```(?:\w+)?\s*|\s*```$')
 
 def setup_logger():
     """
@@ -11,8 +30,18 @@ def setup_logger():
         logger (logging.Logger): Configured logger instance.
     """
     logger = logging.getLogger("RSSFeedMonitor")
+    
+    # Already configured by an earlier call in this process
+    if logger.handlers:
+        return logger
+    
     logger.setLevel(logging.INFO)
     
+    # The handlers below write every record; passing records on to the root
+    # logger as well would print them twice once it has a handler, which the
+    # first module-level logging.info() call installs
+    logger.propagate = False
+    
     # Create logs directory if it doesn't exist
     if not os.path.exists("logs"):
         os.makedirs("logs")
@@ -35,3 +64,124 @@ def setup_logger():
     logger.addHandler(console_handler)
     
     return logger
+
+
+@functools.lru_cache(maxsize=4)
+def get_openai_client(api_key):
+    """
+    Returns the OpenAI client for an API key, shared by every caller in the process.
+    
+    Reusing one client keeps its HTTP connections alive between requests, so
+    filter, grouping and summary calls, and later scheduler cycles, skip the
+    TCP and TLS handshakes. The client is safe to use from several threads.
+    
+    Parameters:
+        api_key (str): OpenAI API key.
+    
+    Returns:
+        OpenAI: Client that retries failed requests OPENAI_MAX_RETRIES times.
+    """
+    # Imported here so modules that only need the JSON and .env helpers,
+    # such as the web dashboard, do not load the OpenAI SDK
+    from openai import OpenAI
+    return OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES)
+
+
+def load_env(path=".env"):
+    """
+    Loads variables from a .env file, re-reading it only when it has changed.
+    
+    Parameters:
+        path (str): Path of the .env file.
+    
+    Returns:
+        dict: Variable names mapped to values, shared between callers.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    
+    cached = _env_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, dotenv_values(path))
+        _env_cache[path] = cached
+    return cached[1]
+
+
+@functools.lru_cache(maxsize=1)
+def get_rss_feed_list(rss_feeds):
+    """
+    Parses the RSS_FEEDS setting into a list of feed URLs.
+    
+    Parameters:
+        rss_feeds (str): Feed URLs separated by newlines or, on a single line, by commas.
+    
+    Returns:
+        tuple: Feed URLs in configured order.
+    """
+    separator = "\n" if "\n" in rss_feeds else ","
+    return tuple(url.strip() for url in rss_feeds.split(separator) if url.strip())
+
+
+def json_dumps(obj, indent=False):
+    """
+    Serializes an object to a JSON string, using orjson when it is installed.
+    
+    Parameters:
+        obj: JSON-serializable object.
+        indent (bool): If True, pretty-print with two-space indentation.
+    
+    Returns:
+        str: JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def json_loads(data):
+    """
+    Parses a JSON document, using orjson when it is installed.
+    
+    Parameters:
+        data (str or bytes): JSON document.
+    
+    Returns:
+        The parsed object. Raises json.JSONDecodeError (which orjson's error subclasses) on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def strip_code_fence(text):
+    """
+    Removes a Markdown code fence wrapped around an LLM response.
+    
+    Parameters:
+        text (str): Response text.
+    
+    Returns:
+        str: The text without a leading ```lang and trailing ``` fence.
+    """
+    if '```' not in text:
+        return text
+    return _FENCE_RE.sub('', text)
+
+
+def write_json_atomic(path, obj):
+    """
+    Writes an object as JSON, replacing the file atomically.
+    
+    The data is written to a temporary file next to path and moved into place,
+    so readers never see a truncated file if the process dies mid-write.
+    
+    Parameters:
+        path (str): Destination file path.
+        obj: JSON-serializable object.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json_dumps(obj))
+    os.replace(tmp_path, path)
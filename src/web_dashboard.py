@@ -4,6 +4,7 @@ from flask import Flask, render_template, jsonify
 import json
 import os
 from datetime import datetime
+from utils import write_json_atomic, json_loads
 
 app = Flask(__name__)
 
@@ -21,15 +22,14 @@ def save_summary(summary_data):
     # Add timestamp
     summary_data["generated_at"] = datetime.now().isoformat()
     
-    with open(SUMMARY_FILE, "w") as f:
-        json.dump(summary_data, f)
+    write_json_atomic(SUMMARY_FILE, summary_data)
 
 @app.route('/')
 def home():
     """Render the dashboard homepage."""
     try:
-        with open(SUMMARY_FILE, "r") as f:
-            summary_data = json.load(f)
+        with open(SUMMARY_FILE, "rb") as f:
+            summary_data = json_loads(f.read())
         
         return render_template('dashboard.html', 
                               summary=summary_data, 
@@ -41,8 +41,8 @@ def home():
 def api_summary():
     """API endpoint to get the latest summary as JSON."""
     try:
-        with open(SUMMARY_FILE, "r") as f:
-            summary_data = json.load(f)
+        with open(SUMMARY_FILE, "rb") as f:
+            summary_data = json_loads(f.read())
         return jsonify(summary_data)
     except (FileNotFoundError, json.JSONDecodeError):
         return jsonify({"topics": [], "generated_at": datetime.now().isoformat()})
@@ -4,20 +4,19 @@ import json
 import os
 import sys
 import logging
-from dotenv import dotenv_values
 
 # Add src directory to path
 sys.path.append('src')
 
 from llm_filter import filter_stories
-from utils import setup_logger
+from utils import setup_logger, load_env
 
 def test_with_reasoning():
     """Test a single obvious disaster article to see GPT's reasoning."""
     logger = setup_logger()
     
     # Load environment
-    env_vars = dotenv_values(".env")
+    env_vars = load_env()
     openai_api_key = env_vars.get("OPENAI_API_KEY")
     filter_prompt = env_vars.get("FILTER_PROMPT", "")
     filter_model = env_vars.get("FILTER_MODEL", "gpt-4-turbo")